@@ -0,0 +1,77 @@
+"""
+Admission control for model-backed requests
+
+Every sentence translation that may run the model needs one of
+max_in_flight slots. A request that cannot get a slot within
+max_queue_wait is shed instead of queueing until the server runs out of
+memory or the client gives up; the caller then answers 503 or falls back
+to the dictionary.
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class AdmissionControl:
+    def __init__(self, max_in_flight, max_queue_wait_ms):
+        """
+        Args:
+            max_in_flight (int): Model-backed requests served at the same time
+            max_queue_wait_ms (float): How long a request may wait for a slot
+        """
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.max_queue_wait = max(0.0, max_queue_wait_ms / 1000.0)
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+
+    def acquire(self, timeout=None):
+        """
+        Wait up to max_queue_wait (or timeout, if shorter) seconds for a slot
+
+        Returns:
+            bool: True if admitted; the caller must release() the slot
+        """
+        wait = self.max_queue_wait if timeout is None else max(0.0, min(timeout, self.max_queue_wait))
+
+        with self._lock:
+            self.waiting += 1
+        admitted = self._slots.acquire(timeout=wait)
+        with self._lock:
+            self.waiting -= 1
+            if admitted:
+                self.in_flight += 1
+                self.admitted += 1
+            else:
+                self.shed += 1
+        return admitted
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    @contextmanager
+    def slot(self, timeout=None):
+        """Context manager around acquire()/release(), yielding whether the request was admitted"""
+        admitted = self.acquire(timeout)
+        try:
+            yield admitted
+        finally:
+            if admitted:
+                self.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_in_flight": self.max_in_flight,
+                "max_queue_wait_ms": self.max_queue_wait * 1000,
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "admitted": self.admitted,
+                "shed": self.shed
+            }
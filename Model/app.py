@@ -1,243 +1,311 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import os
 import json
+import math
 import re
-from difflib import get_close_matches
+import copy
+import hmac
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError, as_completed
 import logging
-import cors from 'cors';
+
+from admission import AdmissionControl
+from batching import MicroBatcher
+from config import TranslationConfig
+from dictionary_store import open_dictionary
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, CallbackMetric, Counter, Histogram, render as render_metrics
+from reloading import DictionaryRevision, ModelRevision, Runtime
+from segmentation import join_sentences, split_sentences
+from translation_cache import TranslationCache
+from word_index import FuzzyIndex, PrefixIndex
 
 # Try to import transformers for ML model
 try:
-    from transformers import MarianMTModel, MarianTokenizer
-    import torch
+    from translator import EnglishToOromoTranslator, model_revision
     ML_AVAILABLE = True
 except ImportError:
     print(" transformers not installed. Running in dictionary-only mode.")
     print(" To install: pip install transformers torch")
     ML_AVAILABLE = False
 
-# TRANSLATOR CLASS (from your translator.py)
+# FLASK API
 
-class EnglishToOromoTranslator:
-    def __init__(self, model_path="./en-om-model"):
-        """Initialize the translator with your trained model"""
-        self.model_path = model_path
-        self.model = None
-        self.tokenizer = None
-        
-        if not ML_AVAILABLE:
-            print("ML libraries not available. Translator will use dictionary only.")
-            return
-        
-        # Check if model exists
-        if not os.path.exists(model_path):
-            print(f"Model not found at {model_path}. Using dictionary only.")
-            return
-        
-        print(f"Loading model from: {model_path}")
-        self.load_model()
-    
-    def load_model(self):
-        """Load the model and tokenizer"""
-        if not ML_AVAILABLE:
-            return
-            
-        try:
-            self.tokenizer = MarianTokenizer.from_pretrained(self.model_path)
-            self.model = MarianMTModel.from_pretrained(self.model_path)
-            self.model.eval()
-            print("ML Model loaded successfully!")
-            print(f"Tokenizer vocab size: {len(self.tokenizer)}")
-        except Exception as e:
-            print(f"Error loading model: {e}")
-            self.model = None
-            self.tokenizer = None
-    
-    def translate(self, text, max_length=128, num_beams=4):
-        """Translate English text to Oromo using ML model"""
-        if not self.model or not self.tokenizer or not text.strip():
-            return None
-        
-        try:
-            inputs = self.tokenizer(
-                text, 
-                return_tensors="pt", 
-                padding=True, 
-                truncation=True,
-                max_length=max_length
-            )
-            
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_length=max_length,
-                    num_beams=num_beams,
-                    early_stopping=True,
-                    do_sample=False
-                )
-            
-            translation = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            return translation
-            
-        except Exception as e:
-            print(f"Translation error: {e}")
-            return None
+app = Flask(__name__)
 
-# FLASK API
+# Also used by the ASGI app (asgi.py)
+CORS_ORIGINS = ["https://cush-learn.onrender.com"]
+CORS_METHODS = ["GET", "POST", "PUT", "DELETE"]
 
-# app = Flask(__name__)
-# CORS(app)  
-app.use(cors({
-  origin: 'https://cush-learn.onrender.com',
-  methods: 'GET,POST,PUT,DELETE',
-  credentials: true
-}));
+CORS(
+    app,
+    origins=CORS_ORIGINS,
+    methods=CORS_METHODS,
+    supports_credentials=True
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global translator instance
-translator = None
-
-#mock data
-DICTIONARY = {
-    "english_to_borana": {
-        "hello": [{"borana": "akkam", "type": "greeting"}],
-        "hi": [{"borana": "akkam", "type": "greeting"}],
-        "water": [{"borana": "bishaan", "type": "noun"}],
-        "food": [{"borana": "nyaata", "type": "noun"}],
-        "good": [{"borana": "gaarii", "type": "adjective"}],
-        "morning": [{"borana": "ganama", "type": "noun"}],
-        "thank": [{"borana": "galata", "type": "verb"}],
-        "thanks": [{"borana": "galata", "type": "verb"}],
-        "you": [{"borana": "ati", "type": "pronoun"}],
-        "house": [{"borana": "mana", "type": "noun"}],
-        "home": [{"borana": "mana", "type": "noun"}],
-        "person": [{"borana": "nama", "type": "noun"}],
-        "people": [{"borana": "namoota", "type": "noun"}],
-        "day": [{"borana": "guyyaa", "type": "noun"}],
-        "night": [{"borana": "halkan", "type": "noun"}],
-        "tree": [{"borana": "muka", "type": "noun"}],
-        "sun": [{"borana": "aduu", "type": "noun"}],
-        "moon": [{"borana": "ji'a", "type": "noun"}],
-        "fire": [{"borana": "ibidda", "type": "noun"}],
-        "love": [{"borana": "jaalala", "type": "noun"}],
-        "peace": [{"borana": "nagaa", "type": "noun"}],
-        "come": [{"borana": "kottu", "type": "verb"}],
-        "go": [{"borana": "deemi", "type": "verb"}],
-        "eat": [{"borana": "nyaadhu", "type": "verb"}],
-        "drink": [{"borana": "dhugu", "type": "verb"}],
-        "yes": [{"borana": "eeyyee", "type": "interjection"}],
-        "no": [{"borana": "lakki", "type": "interjection"}],
-        "beautiful": [{"borana": "bareeddu", "type": "adjective"}],
-        "big": [{"borana": "guddaa", "type": "adjective"}],
-        "small": [{"borana": "xinnaa", "type": "adjective"}],
-        "how": [{"borana": "akkam", "type": "adverb"}],
-        "what": [{"borana": "maal", "type": "pronoun"}],
-        "where": [{"borana": "eessa", "type": "adverb"}],
-        "when": [{"borana": "yoom", "type": "adverb"}],
-        "who": [{"borana": "eenyu", "type": "pronoun"}],
-        "today": [{"borana": "har'a", "type": "adverb"}],
-        "tomorrow": [{"borana": "bori", "type": "adverb"}],
-        "yesterday": [{"borana": "kaleessa", "type": "adverb"}]
-    },
-    "borana_to_english": {
-        "akkam": [{"english": "hello", "type": "greeting"}],
-        "bishaan": [{"english": "water", "type": "noun"}],
-        "nyaata": [{"english": "food", "type": "noun"}],
-        "gaarii": [{"english": "good", "type": "adjective"}],
-        "ganama": [{"english": "morning", "type": "noun"}],
-        "galata": [{"english": "thank", "type": "verb"}],
-        "ati": [{"english": "you", "type": "pronoun"}],
-        "mana": [{"english": "house", "type": "noun"}],
-        "nama": [{"english": "person", "type": "noun"}],
-        "namoota": [{"english": "people", "type": "noun"}],
-        "guyyaa": [{"english": "day", "type": "noun"}],
-        "halkan": [{"english": "night", "type": "noun"}],
-        "muka": [{"english": "tree", "type": "noun"}],
-        "aduu": [{"english": "sun", "type": "noun"}],
-        "ji'a": [{"english": "moon", "type": "noun"}],
-        "ibidda": [{"english": "fire", "type": "noun"}],
-        "jaalala": [{"english": "love", "type": "noun"}],
-        "nagaa": [{"english": "peace", "type": "noun"}],
-        "kottu": [{"english": "come", "type": "verb"}],
-        "deemi": [{"english": "go", "type": "verb"}],
-        "nyaadhu": [{"english": "eat", "type": "verb"}],
-        "dhugu": [{"english": "drink", "type": "verb"}],
-        "eeyyee": [{"english": "yes", "type": "interjection"}],
-        "lakki": [{"english": "no", "type": "interjection"}],
-        "bareeddu": [{"english": "beautiful", "type": "adjective"}],
-        "guddaa": [{"english": "big", "type": "adjective"}],
-        "xinnaa": [{"english": "small", "type": "adjective"}],
-        "maal": [{"english": "what", "type": "pronoun"}],
-        "eessa": [{"english": "where", "type": "adverb"}],
-        "yoom": [{"english": "when", "type": "adverb"}],
-        "eenyu": [{"english": "who", "type": "pronoun"}],
-        "har'a": [{"english": "today", "type": "adverb"}],
-        "bori": [{"english": "tomorrow", "type": "adverb"}],
-        "kaleessa": [{"english": "yesterday", "type": "adverb"}]
+# Caches model translations of repeated inputs (course titles, canned phrases)
+translation_cache = None
+
+# Bounds the model-backed sentence translations served at once
+admission = AdmissionControl(
+    max_in_flight=TranslationConfig.MODEL_MAX_IN_FLIGHT,
+    max_queue_wait_ms=TranslationConfig.MODEL_MAX_QUEUE_WAIT_MS
+)
+
+# Request-path metrics, exported at /metrics (model inference is timed in the translators)
+DICTIONARY_LOOKUP_SECONDS = Histogram("dictionary_lookup_seconds", "Time to look up a word in the dictionary")
+SUGGESTION_SECONDS = Histogram("suggestion_seconds", "Time to compute autocomplete suggestions")
+SEGMENTS_TRANSLATED = Counter(
+    "translation_segments_total",
+    "Sentences translated, by where the translation came from (model, cache or dictionary fallback)",
+    labels=("source",)
+)
+
+# Model translations are cached per direction and decoding profile
+# (TranslationConfig.DECODING_PROFILES); the profile's settings are part of every key
+MODEL_DIRECTION = "en-om"
+
+def build_suggestion_indexes(store):
+    """Autocomplete and fuzzy-match indexes over the compiled dictionary's headwords"""
+    indexes = {}
+    for lang, direction in (("english", store.english), ("borana", store.borana)):
+        # Both query the arrays in the memory-mapped file, so workers share them
+        indexes[lang] = {
+            "prefix": PrefixIndex.from_arrays(direction.headwords, direction.index_arrays),
+            "fuzzy": FuzzyIndex.from_arrays(direction.headwords, direction.index_arrays,
+                                            max_distance=TranslationConfig.FUZZY_MAX_DISTANCE,
+                                            min_query_length=TranslationConfig.FUZZY_MIN_QUERY_LENGTH)
+        }
+    return indexes
+
+def load_dictionary():
+    """
+    Load the dictionary and its suggestion indexes
+    
+    Entries are maintained in datasets/dictionary.tsv and compiled, together
+    with the suggestion indexes (completions ranked by corpus frequency), into
+    a memory-mapped file shared by all workers (see dictionary_store.py).
+    """
+    corpus_files = {
+        "english": TranslationConfig.ENGLISH_CORPUS_FILES,
+        "borana": TranslationConfig.BORANA_CORPUS_FILES
     }
-}
+    store = open_dictionary(TranslationConfig.DICTIONARY_SOURCE, TranslationConfig.DICTIONARY_PATH, corpus_files)
+    return DictionaryRevision(store.as_dict(), build_suggestion_indexes(store), store.revision)
 
-def initialize_translator():
-    """Initialize the translator if available"""
-    global translator
+def load_model():
+    """Load the translator and create a batcher for it (None without ML support or a model folder)"""
+    if not ML_AVAILABLE or not os.path.isdir(TranslationConfig.MODEL_PATH):
+        return None
+    
+    if TranslationConfig.MODEL_BACKEND == 'onnx':
+        from onnx_backend import OnnxTranslator
+        if TranslationConfig.MODEL_QUANTIZED:
+            logger.warning("MODEL_QUANTIZED=1 has no effect with MODEL_BACKEND=onnx; serving the float ONNX export")
+        translator = OnnxTranslator(TranslationConfig.MODEL_PATH, num_threads=TranslationConfig.ONNX_NUM_THREADS)
+    else:
+        translator = EnglishToOromoTranslator(TranslationConfig.MODEL_PATH, quantized=TranslationConfig.MODEL_QUANTIZED)
+    batcher = MicroBatcher(
+        translator.generate_batch,
+        count_tokens=translator.count_tokens,
+        max_wait_ms=TranslationConfig.BATCH_MAX_WAIT_MS,
+        max_batch_size=TranslationConfig.BATCH_MAX_SIZE,
+        max_padded_tokens=TranslationConfig.BATCH_MAX_PADDED_TOKENS,
+        batch_key=translator.batch_key
+    )
+    return ModelRevision(translator, batcher)
+
+def open_translation_cache():
+    """Create the translation cache, shared by all model revisions (the revision is part of every key)"""
+    global translation_cache
+    translation_cache = TranslationCache(
+        max_entries=TranslationConfig.CACHE_MAX_ENTRIES,
+        ttl_seconds=TranslationConfig.CACHE_TTL_SECONDS,
+        path=TranslationConfig.CACHE_PATH or None
+    )
+
+def read_reload_trigger():
+    """Reload request tokens in RELOAD_TRIGGER_PATH, {"dictionary": ..., "model": ...} ({} if there is none)"""
     try:
-        model_path = "./en-om-model"
-        translator = EnglishToOromoTranslator(model_path)
-        logger.info(" Translator initialized")
-    except Exception as e:
-        logger.error(f" Error initializing translator: {e}")
-        translator = None
+        with open(TranslationConfig.RELOAD_TRIGGER_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_reload_trigger(dictionary, model):
+    """Ask every process watching RELOAD_TRIGGER_PATH to reload the given components"""
+    trigger = read_reload_trigger()
+    token = f"{os.getpid()}-{time.time_ns()}"
+    for name, wanted in (("dictionary", dictionary), ("model", model)):
+        if wanted:
+            trigger[name] = token
+    
+    # Replace the file in one step so watchers never read a partial one
+    path = TranslationConfig.RELOAD_TRIGGER_PATH
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(trigger, f)
+    os.replace(temp_path, path)
+
+def file_fingerprints():
+    """Values that change whenever the dictionary source or model folder changes, or a reload is requested"""
+    trigger = read_reload_trigger()
+    fingerprints = {"dictionary": (os.path.getmtime(TranslationConfig.DICTIONARY_SOURCE), trigger.get("dictionary"))}
+    if ML_AVAILABLE and os.path.isdir(TranslationConfig.MODEL_PATH):
+        fingerprints["model"] = (model_revision(TranslationConfig.MODEL_PATH), trigger.get("model"))
+    return fingerprints
+
+# Active dictionary and model revisions; swapped atomically on reload
+runtime = Runtime(load_dictionary, load_model)
+runtime.reload(dictionary=True, model=False, background=False)
+
+def cache_stat(name):
+    return lambda: translation_cache.stats()[name] if translation_cache else None
+
+CallbackMetric("translation_queue_depth", "Sentences waiting for a model batch",
+               lambda: runtime.model.batcher.queue_depth() if runtime.model else 0)
+CallbackMetric("translation_cache_hits_total", "Translation cache hits", cache_stat("hits"), type="counter")
+CallbackMetric("translation_cache_misses_total", "Translation cache misses", cache_stat("misses"), type="counter")
+CallbackMetric("translation_cache_hit_ratio", "Share of translation cache lookups that hit", cache_stat("hit_ratio"))
+CallbackMetric("translation_cache_entries", "Translations held in memory", cache_stat("entries"))
+CallbackMetric("admission_in_flight", "Model-backed requests being served", lambda: admission.in_flight)
+CallbackMetric("admission_waiting", "Model-backed requests waiting for a slot", lambda: admission.waiting)
+CallbackMetric("admission_shed_total", "Model-backed requests shed by admission control",
+               lambda: admission.shed, type="counter")
+
+def initialize_translator():
+    """
+    Start loading the translator according to TranslationConfig.MODEL_LOADING
+    
+    In 'background' mode this returns immediately; sentence translations use
+    the dictionary until the model is ready. In 'preload' mode the model is
+    loaded before returning and per-process setup is left to init_worker().
+    """
+    mode = TranslationConfig.MODEL_LOADING
+    if mode != 'preload':
+        init_worker()
+    
+    if mode == 'off':
+        runtime.model_state = "disabled"
+    elif mode in ('eager', 'preload'):
+        runtime.reload(dictionary=False, model=True, background=False)
+        if runtime.model:
+            logger.info(" Translator initialized")
+    else:
+        runtime.reload(dictionary=False, model=True, background=True)
+        logger.info(" Loading translator in the background")
+
+def init_worker(num_threads=None):
+    """
+    Per-process setup: translation cache and reload watcher
+    
+    Pre-fork servers call this in each worker after forking (see
+    gunicorn.conf.py), since sqlite connections and threads do not survive
+    a fork. The model weights loaded before the fork stay shared with the
+    master copy-on-write.
+    
+    Args:
+        num_threads (int): Torch intra-op threads for this process
+    """
+    if ML_AVAILABLE:
+        open_translation_cache()
+        if num_threads:
+            import torch
+            torch.set_num_threads(num_threads)
+    
+    if TranslationConfig.RELOAD_WATCH_INTERVAL > 0:
+        runtime.watch(file_fingerprints, TranslationConfig.RELOAD_WATCH_INTERVAL)
+
+# Runs on import, so WSGI servers (gunicorn) load the model too
+initialize_translator()
 
 def get_word_suggestions(query, lang, limit=5):
     """Get word suggestions based on partial input"""
+    start = time.perf_counter()
     query = query.lower().strip()
     
     if lang == 'english':
-        words = list(DICTIONARY["english_to_borana"].keys())
+        indexes = runtime.dictionary.indexes["english"]
     else:
-        words = list(DICTIONARY["borana_to_english"].keys())
+        indexes = runtime.dictionary.indexes["borana"]
     
-    # Filter words that start with the query
-    matches = [word for word in words if word.lower().startswith(query)]
+    # Most frequent words that start with the query
+    matches = indexes["prefix"].complete(query, limit)
     
     # If no exact matches, use fuzzy matching
     if not matches:
-        matches = get_close_matches(query, words, n=limit, cutoff=0.6)
+        matches = indexes["fuzzy"].close_matches(query, n=limit, cutoff=0.6)
     
+    SUGGESTION_SECONDS.observe(time.perf_counter() - start)
     return matches[:limit]
 
-def translate_word(word, source_lang):
+def translate_word(word, source_lang, entries=None):
     """Translate a single word using dictionary"""
+    start = time.perf_counter()
     word = word.lower().strip()
+    entries = entries or runtime.dictionary.entries
     
     if source_lang == 'english':
-        dictionary = DICTIONARY["english_to_borana"]
+        dictionary = entries["english_to_borana"]
     else:
-        dictionary = DICTIONARY["borana_to_english"]
+        dictionary = entries["borana_to_english"]
     
-    return dictionary.get(word, [])
+    translations = dictionary.get(word, [])
+    DICTIONARY_LOOKUP_SECONDS.observe(time.perf_counter() - start)
+    return translations
 
-def translate_sentence(sentence, source_lang):
-    """Translate a sentence"""
-    # First try ML model for English to Oromo
-    if translator and source_lang == 'english':
-        try:
-            result = translator.translate(sentence)
-            if result and result.strip():
-                return result
-        except Exception as e:
-            logger.error(f"ML translation error: {e}")
+def uses_model(source_lang):
+    """Whether sentence translations from source_lang go through the model (and admission control)"""
+    return runtime.model is not None and source_lang == 'english'
+
+def overloaded_response(text):
+    """503 with Retry-After for a request shed by admission control"""
+    return {
+        "success": False,
+        "message": "The translation model is overloaded, please retry",
+        "original": text
+    }, 503, {"Retry-After": str(TranslationConfig.MODEL_RETRY_AFTER_S)}
+
+def request_deadline(deadline_ms):
+    """
+    time.monotonic() deadline for a request's deadline_ms (capped at
+    BULK_MAX_DEADLINE_MS), or None unless it is a finite positive number
+    """
+    if isinstance(deadline_ms, bool) or not isinstance(deadline_ms, (int, float)):
+        return None
+    if not math.isfinite(deadline_ms) or deadline_ms <= 0:
+        return None
+    return time.monotonic() + min(deadline_ms, TranslationConfig.BULK_MAX_DEADLINE_MS) / 1000.0
+
+def translate_sentence(sentence, source_lang, profile=TranslationConfig.DEFAULT_PROFILE, deadline=None):
+    """
+    Translate a text of one or more sentences
+    
+    The text is split into sentences (see segmentation.py), which are
+    translated as one batch and joined back with the original whitespace.
     
-    # Fallback to word-by-word translation
+    Args:
+        profile (str): Decoding profile name (TranslationConfig.DECODING_PROFILES)
+        deadline (float): time.monotonic() value at which model generation
+            stops and returns the best hypothesis so far
+    """
+    segments, separators = split_sentences(sentence, TranslationConfig.MAX_SEGMENT_WORDS)
+    translations = translate_segments(segments, source_lang, profile, deadline)
+    return join_sentences([translations[s] for s in segments], separators)
+
+def translate_sentence_by_word(sentence, source_lang):
+    """Word-by-word dictionary translation, used when the ML model is unavailable"""
     words = re.findall(r'\b\w+\b', sentence.lower())
     translated_words = []
+    entries = runtime.dictionary.entries
     
     for word in words:
-        translations = translate_word(word, source_lang)
+        translations = translate_word(word, source_lang, entries)
         if translations:
             if source_lang == 'english':
                 translated_words.append(translations[0]['borana'])
@@ -248,14 +316,159 @@ def translate_sentence(sentence, source_lang):
     
     return " ".join(translated_words)
 
-# API ENDPOINTS
+def iter_segment_translations(segments, source_lang, profile, deadline, timeout=None, lead=0):
+    """
+    Translate sentence segments, yielding (segment, translation) as each is ready
+    
+    Each distinct segment is translated (and cached) once, however often it
+    repeats: cached ones first, then model translations in the order their
+    batches finish. Segments the model cannot translate fall back to the
+    dictionary. Segments unfinished after timeout are not yielded.
+    
+    Args:
+        segments (list): Sentences to translate
+        source_lang (str): 'english' or 'borana'
+        profile (str): Decoding profile name (TranslationConfig.DECODING_PROFILES)
+        deadline (float): time.monotonic() value at which model generation
+            stops and returns the best hypothesis so far
+        timeout (float): Seconds to wait for the model (default: until done)
+        lead (int): Translate the first lead uncached segments (in text order)
+            in a batch of their own before the rest, so a streaming client
+            gets its first sentence after one sentence's latency
+    """
+    # Hold the model revision until the last segment is done, so a reload
+    # cannot close its batcher before every segment has been submitted
+    with runtime.use_model() as model:
+        if not (model and source_lang == 'english'):
+            for segment in dict.fromkeys(segments):
+                SEGMENTS_TRANSLATED.inc(source="dictionary")
+                yield segment, translate_sentence_by_word(segment, source_lang)
+            return
+        
+        # None until init_worker() runs (gunicorn calls it after forking);
+        # translate without caching until then
+        cache = translation_cache
+        params = TranslationConfig.DECODING_PROFILES[profile]
+        missing = []
+        for segment in dict.fromkeys(segments):
+            cached = cache.get(segment, MODEL_DIRECTION, model.revision, params) if cache else None
+            if cached is None:
+                missing.append(segment)
+            else:
+                SEGMENTS_TRANSLATED.inc(source="cache")
+                yield segment, cached
+        
+        # Lead segments first, then the rest in token-length order so consecutive
+        # micro-batches pad tightly
+        waves = [missing[:lead], sorted(missing[lead:], key=model.batcher.count_tokens)]
+        end = time.monotonic() + timeout if timeout is not None else None
+        futures = {}
+        try:
+            for wave in waves:
+                submitted = {}
+                for segment in wave:
+                    try:
+                        submitted[model.batcher.submit(segment, deadline, **params)] = segment
+                    except Exception as e:
+                        logger.error(f"ML translation error: {e}")
+                        SEGMENTS_TRANSLATED.inc(source="dictionary")
+                        yield segment, translate_sentence_by_word(segment, source_lang)
+                futures.update(submitted)
+            
+                remaining = max(0, end - time.monotonic()) if end is not None else None
+                for future in as_completed(submitted, timeout=remaining):
+                    segment = submitted[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"ML translation error: {e}")
+                        result = None
+                    if result and result.strip():
+                        # Translations cut short by the deadline are returned but not cached
+                        if cache and not future.deadline_exceeded:
+                            cache.put(segment, MODEL_DIRECTION, model.revision, params, result)
+                        SEGMENTS_TRANSLATED.inc(source="model")
+                        yield segment, result
+                    else:
+                        SEGMENTS_TRANSLATED.inc(source="dictionary")
+                        yield segment, translate_sentence_by_word(segment, source_lang)
+        except FuturesTimeoutError:
+            pass
+        finally:
+            # Drop queued work after a timeout, or when a streaming client disconnects
+            for future in futures:
+                future.cancel()
 
-@app.route('/api/dictionary', methods=['GET'])
-def get_dictionary_stats():
-    """Get dictionary statistics"""
+def translate_segments(segments, source_lang, profile, deadline, timeout=None):
+    """
+    Translate sentence segments, batching model inference across them
+    
+    Returns:
+        dict: segment -> translation; None for segments unfinished after timeout
+            (see iter_segment_translations for the arguments)
+    """
+    translations = dict.fromkeys(segments)
+    translations.update(iter_segment_translations(segments, source_lang, profile, deadline, timeout))
+    return translations
+
+def translate_sentences(sentences, source_lang, deadline, profile=TranslationConfig.DEFAULT_BATCH_PROFILE):
+    """
+    Translate many texts, batching model inference across all their sentences
+    
+    Args:
+        sentences (list): Texts to translate
+        source_lang (str): 'english' or 'borana'
+        deadline (float): time.monotonic() value after which to stop waiting
+            (generation running at that point returns what it has)
+        profile (str): Decoding profile name (TranslationConfig.DECODING_PROFILES)
+    
+    Returns:
+        list: Translations in input order; None where the deadline was hit
+    """
+    split = [split_sentences(text, TranslationConfig.MAX_SEGMENT_WORDS) for text in sentences]
+    translations = translate_segments(
+        [s for segments, _ in split for s in segments], source_lang, profile, deadline, timeout=max(0, deadline - time.monotonic())
+    )
+    
+    results = []
+    for segments, separators in split:
+        parts = [translations[s] for s in segments]
+        results.append(None if None in parts else join_sentences(parts, separators))
+    return results
+
+def collect_document_texts(node, fields, path=()):
+    """Yield (path, text) for every non-empty string stored under one of fields"""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if isinstance(value, str):
+                if key in fields and value.strip():
+                    yield path + (key,), value
+            else:
+                yield from collect_document_texts(value, fields, path + (key,))
+    elif isinstance(node, list):
+        for index, value in enumerate(node):
+            yield from collect_document_texts(value, fields, path + (index,))
+
+def set_document_text(document, path, text):
+    """Replace the string at path in a nested document"""
+    node = document
+    for key in path[:-1]:
+        node = node[key]
+    node[path[-1]] = text
+
+# REQUEST HANDLERS
+# Shared by the Flask routes below and the ASGI app (asgi.py); each returns
+# (JSON payload, HTTP status), plus a dict of headers where needed
+
+# Keep proxies (nginx, Render) from buffering Server-Sent Events
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def dictionary_stats_response():
+    """Dictionary statistics (GET /api/dictionary)"""
     try:
-        english_words = len(DICTIONARY["english_to_borana"])
-        borana_words = len(DICTIONARY["borana_to_english"])
+        entries = runtime.dictionary.entries
+        english_words = len(entries["english_to_borana"])
+        borana_words = len(entries["borana_to_english"])
         
         stats = {
             "english_words": english_words,
@@ -263,147 +476,529 @@ def get_dictionary_stats():
             "total_entries": english_words + borana_words
         }
         
-        return jsonify({
+        return {
             "success": True,
             "stats": stats
-        })
+        }, 200
     except Exception as e:
         logger.error(f"Error getting dictionary stats: {e}")
-        return jsonify({
+        return {
             "success": False,
             "message": "Error retrieving dictionary statistics"
-        }), 500
+        }, 500
 
-@app.route('/api/suggestions', methods=['GET'])
-def get_suggestions():
-    """Get word suggestions for autocomplete"""
+def suggestions_response(query, lang):
+    """Word suggestions for autocomplete (GET /api/suggestions)"""
     try:
-        query = request.args.get('q', '').strip()
-        lang = request.args.get('lang', 'english').lower()
+        query = query.strip()
+        lang = lang.lower()
         
         if not query or len(query) < 2:
-            return jsonify({
+            return {
                 "success": True,
                 "suggestions": []
-            })
+            }, 200
         
         suggestions = get_word_suggestions(query, lang)
         
-        return jsonify({
+        return {
             "success": True,
             "suggestions": suggestions
-        })
+        }, 200
     except Exception as e:
         logger.error(f"Error getting suggestions: {e}")
-        return jsonify({
+        return {
             "success": False,
             "suggestions": []
-        }), 500
+        }, 500
 
-@app.route('/api/translate', methods=['POST'])
-def translate():
-    """Main translation endpoint"""
+def translate_response(data):
+    """
+    Main translation endpoint (POST /api/translate)
+    
+    Sentence translations accept an optional "profile" (see
+    TranslationConfig.DECODING_PROFILES, default 'interactive') and
+    "deadline_ms", after which generation returns what it has so far
+    (defaults to the profile's deadline).
+    """
     try:
-        data = request.get_json()
-        
         if not data:
-            return jsonify({
+            return {
                 "success": False,
                 "message": "No data provided"
-            }), 400
+            }, 400
         
         text = data.get('text', '').strip()
         source_lang = data.get('source_lang', 'english').lower()
         translation_type = data.get('type', 'word').lower()
+        profile = data.get('profile', TranslationConfig.DEFAULT_PROFILE)
+        deadline_ms = data.get('deadline_ms', TranslationConfig.DECODING_DEADLINES_MS.get(profile))
         
         if not text:
-            return jsonify({
+            return {
                 "success": False,
                 "message": "No text provided"
-            }), 400
+            }, 400
+        
+        if profile not in TranslationConfig.DECODING_PROFILES:
+            return {
+                "success": False,
+                "message": f"Unknown profile '{profile}' (use one of: {', '.join(TranslationConfig.DECODING_PROFILES)})"
+            }, 400
+        
+        deadline = request_deadline(deadline_ms)
+        if deadline is None:
+            return {
+                "success": False,
+                "message": "deadline_ms must be a positive number"
+            }, 400
         
-        logger.info(f"Translating: '{text}' from {source_lang} ({translation_type})")
+        # Per-request logging is debug-only; request volumes and timings are in /metrics
+        logger.debug("Translating: %r from %s (%s)", text, source_lang, translation_type)
         
         if translation_type == 'word':
             # Word translation
             translations = translate_word(text, source_lang)
             
             if translations:
-                return jsonify({
+                return {
                     "success": True,
                     "translations": translations,
                     "original": text,
                     "source_lang": source_lang,
                     "type": "word"
-                })
+                }, 200
             else:
                 # Get suggestions for similar words
                 suggestions = get_word_suggestions(text, source_lang)
-                return jsonify({
+                return {
                     "success": False,
                     "message": f"Translation not found for '{text}'",
                     "suggestions": suggestions,
                     "original": text
-                })
+                }, 200
         
         else:
             # Sentence translation
-            translation = translate_sentence(text, source_lang)
+            model_backed = uses_model(source_lang)
+            admitted = model_backed and admission.acquire(deadline - time.monotonic())
+            degraded = model_backed and not admitted
+            
+            if not degraded:
+                try:
+                    translation = translate_sentence(text, source_lang, profile, deadline)
+                finally:
+                    if admitted:
+                        admission.release()
+            elif TranslationConfig.MODEL_OVERLOAD_POLICY == 'reject':
+                return overloaded_response(text)
+            else:
+                # Answer from the dictionary rather than queue behind the model
+                translation = translate_sentence_by_word(text, source_lang)
             
             if translation:
-                return jsonify({
+                return {
                     "success": True,
                     "translation": translation,
                     "original": text,
                     "source_lang": source_lang,
-                    "type": "sentence"
-                })
+                    "type": "sentence",
+                    "profile": profile,
+                    "degraded": degraded
+                }, 200
             else:
-                return jsonify({
+                return {
                     "success": False,
                     "message": "Translation failed",
                     "original": text
-                })
+                }, 200
     
     except Exception as e:
         logger.error(f"Translation error: {e}")
-        return jsonify({
+        return {
             "success": False,
             "message": "Internal server error"
-        }), 500
+        }, 500
 
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    """Health check endpoint"""
-    ml_available = translator is not None and translator.model is not None
-    return jsonify({
+def server_sent_event(event, data):
+    """Format one Server-Sent Events message with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def translation_stream(data):
+    """
+    Sentence translation streamed as Server-Sent Events (POST /api/translate/stream)
+    
+    Takes the same payload as a sentence /api/translate request and sends
+    each sentence's translation as soon as it is ready, so the first one
+    arrives after about one sentence's latency rather than the whole text's:
+    
+        event: start    {"segments": [...], "separators": [...], "profile": ...}
+        event: segment  {"index": i, "translation": ...}   (any order)
+        event: done     {"translation": ...}
+    
+    The full text is separators[0] + segments[0] + separators[1] + ...,
+    with each segment replaced by its translation.
+    
+    Returns:
+        tuple: (events, 200) with a generator of the messages, or
+            (error payload, status) for an invalid request
+    """
+    if not data:
+        return {
+            "success": False,
+            "message": "No data provided"
+        }, 400
+    
+    text = data.get('text', '').strip()
+    source_lang = data.get('source_lang', 'english').lower()
+    profile = data.get('profile', TranslationConfig.DEFAULT_PROFILE)
+    deadline_ms = data.get('deadline_ms', TranslationConfig.DECODING_DEADLINES_MS.get(profile))
+    
+    if not text:
+        return {
+            "success": False,
+            "message": "No text provided"
+        }, 400
+    
+    if profile not in TranslationConfig.DECODING_PROFILES:
+        return {
+            "success": False,
+            "message": f"Unknown profile '{profile}' (use one of: {', '.join(TranslationConfig.DECODING_PROFILES)})"
+        }, 400
+    
+    deadline = request_deadline(deadline_ms)
+    if deadline is None:
+        return {
+            "success": False,
+            "message": "deadline_ms must be a positive number"
+        }, 400
+    
+    logger.debug("Streaming translation of %d characters from %s", len(text), source_lang)
+    
+    model_backed = uses_model(source_lang)
+    admitted = model_backed and admission.acquire(deadline - time.monotonic())
+    degraded = model_backed and not admitted
+    if degraded and TranslationConfig.MODEL_OVERLOAD_POLICY == 'reject':
+        return overloaded_response(text)
+    
+    segments, separators = split_sentences(text, TranslationConfig.MAX_SEGMENT_WORDS)
+    
+    def events():
+        try:
+            yield server_sent_event("start", {
+                "segments": segments,
+                "separators": separators,
+                "source_lang": source_lang,
+                "profile": profile,
+                "degraded": degraded
+            })
+            
+            positions = {}
+            for index, segment in enumerate(segments):
+                positions.setdefault(segment, []).append(index)
+            
+            if degraded:
+                # Answer from the dictionary rather than queue behind the model
+                ready = ((s, translate_sentence_by_word(s, source_lang)) for s in positions)
+            else:
+                ready = iter_segment_translations(segments, source_lang, profile, deadline, lead=1)
+            
+            translations = [None] * len(segments)
+            try:
+                for segment, translation in ready:
+                    for index in positions[segment]:
+                        translations[index] = translation
+                        yield server_sent_event("segment", {"index": index, "translation": translation})
+            except Exception as e:
+                logger.error(f"Streaming translation error: {e}")
+                yield server_sent_event("error", {"message": "Internal server error"})
+                return
+            
+            yield server_sent_event("done", {"translation": join_sentences(translations, separators)})
+        finally:
+            if admitted:
+                admission.release()
+    
+    # Start the generator right away, so that its cleanup (releasing the
+    # admission slot) runs even if the client leaves before the first message
+    stream = events()
+    first = next(stream)
+    
+    def messages():
+        yield first
+        yield from stream
+    
+    return messages(), 200
+
+def translate_batch_response(data):
+    """
+    Translate many texts in one call (POST /api/translate/batch)
+    
+    Accepts either {"texts": [...]} or {"document": {...}, "fields": [...]},
+    where every string under one of fields (default title/description/content)
+    in the nested document is translated. Texts still unfinished when
+    deadline_ms expires are returned as null and listed in "pending".
+    "profile" picks the decoding profile (default 'batch').
+    """
+    try:
+        if not data:
+            return {
+                "success": False,
+                "message": "No data provided"
+            }, 400
+        
+        source_lang = data.get('source_lang', 'english').lower()
+        translation_type = data.get('type', 'sentence').lower()
+        profile = data.get('profile', TranslationConfig.DEFAULT_BATCH_PROFILE)
+        deadline_ms = data.get('deadline_ms', TranslationConfig.BULK_DEFAULT_DEADLINE_MS)
+        
+        if profile not in TranslationConfig.DECODING_PROFILES:
+            return {
+                "success": False,
+                "message": f"Unknown profile '{profile}' (use one of: {', '.join(TranslationConfig.DECODING_PROFILES)})"
+            }, 400
+        
+        deadline = request_deadline(deadline_ms)
+        if deadline is None:
+            return {
+                "success": False,
+                "message": "deadline_ms must be a positive number"
+            }, 400
+        
+        document = data.get('document')
+        if document is not None:
+            fields = data.get('fields') or TranslationConfig.BULK_DOCUMENT_FIELDS
+            if not isinstance(fields, list) or not all(isinstance(f, str) for f in fields):
+                return {
+                    "success": False,
+                    "message": "'fields' must be a list of strings"
+                }, 400
+            fields = set(fields)
+            paths, texts = [], []
+            for path, text in collect_document_texts(document, fields):
+                paths.append(path)
+                texts.append(text)
+        else:
+            texts = data.get('texts')
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                return {
+                    "success": False,
+                    "message": "Provide 'texts' as a list of strings or a 'document' object"
+                }, 400
+        
+        if len(texts) > TranslationConfig.BULK_MAX_TEXTS:
+            return {
+                "success": False,
+                "message": f"Too many texts (maximum {TranslationConfig.BULK_MAX_TEXTS})"
+            }, 413
+        
+        logger.debug("Batch translating %d texts from %s (%s)", len(texts), source_lang, translation_type)
+        
+        if translation_type == 'word':
+            translations = [translate_word(text, source_lang) for text in texts]
+        else:
+            translations = translate_sentences(texts, source_lang, deadline, profile)
+        
+        pending = [i for i, t in enumerate(translations) if t is None]
+        response = {
+            "success": True,
+            "complete": not pending,
+            "source_lang": source_lang,
+            "type": translation_type,
+            "profile": profile
+        }
+        
+        if document is not None:
+            translated = copy.deepcopy(document)
+            for path, translation in zip(paths, translations):
+                if translation is not None:
+                    set_document_text(translated, path, translation)
+            response["document"] = translated
+            response["pending"] = [".".join(str(key) for key in paths[i]) for i in pending]
+        else:
+            response["translations"] = translations
+            response["pending"] = pending
+        
+        return response, 200
+    
+    except Exception as e:
+        logger.error(f"Batch translation error: {e}")
+        return {
+            "success": False,
+            "message": "Internal server error"
+        }, 500
+
+def health_response():
+    """Liveness check (GET /api/health); healthy as soon as the dictionary is served, even while the model loads"""
+    ml_available = runtime.model is not None
+    return {
         "status": "healthy",
         "ml_model_available": ml_available,
-        "dictionary_words": len(DICTIONARY["english_to_borana"]),
+        "model_state": runtime.model_state,
+        "dictionary_words": len(runtime.dictionary.entries["english_to_borana"]),
+        "revisions": runtime.status(),
+        "cache": translation_cache.stats() if translation_cache else None,
+        "admission": admission.stats(),
         "translation_modes": ["dictionary"] + (["ml_model"] if ml_available else [])
-    })
+    }, 200
 
-@app.route('/', methods=['GET'])
-def index():
-    """Root endpoint with API info"""
-    ml_status = " Available" if (translator and translator.model) else " Dictionary only"
+def readiness_response():
+    """
+    Readiness check (GET /api/ready); 503 until model loading has finished
+    
+    Ready once the model is loaded, or when there is no model to load
+    (ML libraries or model folder missing, MODEL_LOADING=off). A model
+    that failed to load keeps the instance unready.
+    """
+    state = runtime.model_state
+    ready = state in ("loaded", "unavailable", "disabled")
+    return {
+        "ready": ready,
+        "model_state": state,
+        "ml_model_available": runtime.model is not None,
+        "error": (runtime.last_reload or {}).get("errors", {}).get("model") if state == "failed" else None
+    }, 200 if ready else 503
+
+def reload_response(admin_token, data):
+    """
+    Reload the dictionary and/or model in the background (POST /api/admin/reload)
+    
+    Requires the X-Admin-Token header to match the ADMIN_TOKEN environment
+    variable; the endpoint is disabled when ADMIN_TOKEN is not set. Body:
+    {"dictionary": true, "model": false}
+    
+    With RELOAD_TRIGGER_PATH and a reload watcher, the request goes to every
+    worker process (this one included) through the trigger file, and they
+    reload within RELOAD_WATCH_INTERVAL seconds. Otherwise only this
+    process reloads.
+    """
+    token = TranslationConfig.ADMIN_TOKEN
+    if not token or not hmac.compare_digest(admin_token or '', token):
+        return {
+            "success": False,
+            "message": "Forbidden"
+        }, 403
+    
+    data = data or {}
+    reload_dictionary = bool(data.get('dictionary', True))
+    reload_model = bool(data.get('model', False))
     
-    return jsonify({
+    if reload_model and not ML_AVAILABLE:
+        return {
+            "success": False,
+            "message": "ML libraries not installed"
+        }, 400
+    
+    if TranslationConfig.RELOAD_TRIGGER_PATH and TranslationConfig.RELOAD_WATCH_INTERVAL > 0:
+        try:
+            write_reload_trigger(reload_dictionary, reload_model)
+        except OSError as e:
+            logger.error(f"Could not write reload trigger: {e}")
+            return {
+                "success": False,
+                "message": "Could not request the reload"
+            }, 500
+        message = f"Reload requested from every worker (within {TranslationConfig.RELOAD_WATCH_INTERVAL:g}s)"
+    else:
+        runtime.reload(dictionary=reload_dictionary, model=reload_model)
+        message = "Reload started"
+    logger.info(f"Reload requested (dictionary={reload_dictionary}, model={reload_model})")
+    
+    return {
+        "success": True,
+        "message": message,
+        "revisions": runtime.status()
+    }, 202
+
+def api_info_response():
+    """Root endpoint with API info (GET /)"""
+    ml_status = " Available" if runtime.model else " Dictionary only"
+    
+    return {
         "message": "English-Oromo/Borana Translation API",
         "version": "1.0.0",
         "ml_model_status": ml_status,
-        "dictionary_size": len(DICTIONARY["english_to_borana"]),
+        "dictionary_size": len(runtime.dictionary.entries["english_to_borana"]),
         "endpoints": {
             "translate": "POST /api/translate",
+            "translate_stream": "POST /api/translate/stream",
+            "translate_batch": "POST /api/translate/batch",
             "suggestions": "GET /api/suggestions",
             "dictionary": "GET /api/dictionary",
-            "health": "GET /api/health"
+            "health": "GET /api/health",
+            "ready": "GET /api/ready",
+            "metrics": "GET /metrics"
         },
         "usage": {
             "start_ui": "Open your React app and it will connect automatically",
             "test_api": "POST to /api/translate with {'text': 'hello', 'source_lang': 'english', 'type': 'word'}"
         }
-    })
+    }, 200
+
+# API ENDPOINTS
+
+def json_response(result):
+    """Flask response for the (payload, status[, headers]) returned by a request handler"""
+    payload, status, *headers = result
+    return jsonify(payload), status, *headers
+
+@app.route('/api/dictionary', methods=['GET'])
+def get_dictionary_stats():
+    """Get dictionary statistics"""
+    return json_response(dictionary_stats_response())
+
+@app.route('/api/suggestions', methods=['GET'])
+def get_suggestions():
+    """Get word suggestions for autocomplete"""
+    return json_response(suggestions_response(request.args.get('q', ''), request.args.get('lang', 'english')))
+
+@app.route('/api/translate', methods=['POST'])
+def translate():
+    """Translate a word or sentence"""
+    return json_response(translate_response(request.get_json(silent=True)))
+
+@app.route('/api/translate/stream', methods=['POST'])
+def translate_stream():
+    """Translate a text, streaming each sentence as Server-Sent Events"""
+    result = translation_stream(request.get_json(silent=True))
+    if result[1] != 200:
+        return json_response(result)
+    
+    return Response(
+        stream_with_context(result[0]),
+        mimetype='text/event-stream',
+        headers=STREAM_HEADERS
+    )
+
+@app.route('/api/translate/batch', methods=['POST'])
+def translate_batch():
+    """Translate many texts in one call"""
+    return json_response(translate_batch_response(request.get_json(silent=True)))
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    """Liveness check"""
+    return json_response(health_response())
+
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness check"""
+    return json_response(readiness_response())
+
+@app.route('/api/admin/reload', methods=['POST'])
+def reload_resources():
+    """Reload the dictionary and/or model"""
+    return json_response(reload_response(request.headers.get('X-Admin-Token'), request.get_json(silent=True)))
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics"""
+    return Response(render_metrics(), mimetype=METRICS_CONTENT_TYPE)
+
+@app.route('/', methods=['GET'])
+def index():
+    """Root endpoint with API info"""
+    return json_response(api_info_response())
 
 # MAIN - START THE APP
 
@@ -448,12 +1043,11 @@ if __name__ == '__main__':
     print(" ENGLISH-OROMO/BORANA TRANSLATION API")
     print("=" * 60)
     
-    # Initialize translator
-    initialize_translator()
-    
-    # Show status
-    if translator and translator.model:
+    # Show status (the translator started loading on import)
+    if runtime.model:
         print(" ML Model: Available (English → Oromo)")
+    elif runtime.model_state == "loading":
+        print(" ML Model: Loading in the background, dictionary mode until ready")
     else:
         print(" Dictionary Mode: Available (English ↔ Borana)")
         if ML_AVAILABLE:
@@ -461,7 +1055,7 @@ if __name__ == '__main__':
         else:
             print(" To install ML support: pip install transformers torch")
     
-    print(f" Dictionary: {len(DICTIONARY['english_to_borana'])} word pairs loaded")
+    print(f" Dictionary: {len(runtime.dictionary.entries['english_to_borana'])} word pairs loaded")
     print("=" * 60)
     print(" Server starting at: http://localhost:5001")  # Changed from 5000 to 5001
     print(" API Documentation: http://localhost:5001")   # Changed from 5000 to 5001
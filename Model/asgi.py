@@ -0,0 +1,188 @@
+"""
+ASGI entry point for the translation API
+
+    cd Model && uvicorn asgi:app --port 5001
+
+Serves the same routes as the Flask app in app.py, using its request
+handlers. Dictionary lookups (word translation, suggestions, stats) and
+requests that may run the model (sentence, batch and streaming
+translation) run in separate bounded worker pools (see worker_pools.py),
+so bursts of keystroke-driven suggestion requests never wait behind a
+model call. A request arriving while its pool's queue is full gets 503;
+queue depths are reported under "pools" in /api/health.
+"""
+
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app import (
+    CORS_METHODS,
+    CORS_ORIGINS,
+    STREAM_HEADERS,
+    api_info_response,
+    dictionary_stats_response,
+    health_response,
+    readiness_response,
+    reload_response,
+    suggestions_response,
+    translate_batch_response,
+    translate_response,
+    translation_stream
+)
+from config import TranslationConfig
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, CallbackMetric, render as render_metrics
+from worker_pools import PoolFull, WorkerPool
+
+dictionary_pool = WorkerPool(
+    "dictionary",
+    max_workers=TranslationConfig.ASGI_DICTIONARY_WORKERS,
+    max_queue=TranslationConfig.ASGI_DICTIONARY_QUEUE
+)
+model_pool = WorkerPool(
+    "model",
+    max_workers=TranslationConfig.ASGI_MODEL_WORKERS,
+    max_queue=TranslationConfig.ASGI_MODEL_QUEUE
+)
+
+
+def pool_stat(name):
+    return lambda: {(pool.name,): pool.stats()[name] for pool in (dictionary_pool, model_pool)}
+
+
+CallbackMetric("worker_pool_queued", "Requests waiting for a pool worker", pool_stat("queued"), labels=("pool",))
+CallbackMetric("worker_pool_active", "Requests running on pool workers", pool_stat("active"), labels=("pool",))
+CallbackMetric("worker_pool_rejected_total", "Requests rejected because the pool queue was full",
+               pool_stat("rejected"), type="counter", labels=("pool",))
+
+
+def json_response(result):
+    """Starlette response for the (payload, status[, headers]) returned by a request handler"""
+    payload, status, *headers = result
+    return JSONResponse(payload, status_code=status, headers=headers[0] if headers else None)
+
+
+async def read_json(request):
+    """The request's JSON body, or None if it is missing or invalid"""
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+def pool_for(data, default_type):
+    """The pool for a translate request: word lookups only touch the dictionary"""
+    if isinstance(data, dict) and str(data.get('type', default_type)).lower() == 'word':
+        return dictionary_pool
+    return model_pool
+
+
+async def pool_full(request, exc):
+    return JSONResponse({
+        "success": False,
+        "message": f"Server busy ({exc} queue full), please retry"
+    }, status_code=503)
+
+
+async def get_dictionary_stats(request):
+    return json_response(await dictionary_pool.run(dictionary_stats_response))
+
+
+async def get_suggestions(request):
+    return json_response(await dictionary_pool.run(
+        suggestions_response,
+        request.query_params.get('q', ''),
+        request.query_params.get('lang', 'english')
+    ))
+
+
+async def translate(request):
+    data = await read_json(request)
+    return json_response(await pool_for(data, 'word').run(translate_response, data))
+
+
+async def translate_stream(request):
+    # Runs in the model pool: waiting for an admission slot blocks
+    result = await model_pool.run(translation_stream, await read_json(request))
+    if result[1] != 200:
+        return json_response(result)
+
+    # The rest of an accepted stream is never rejected by the pool
+    end = object()
+    events = result[0]
+
+    async def messages():
+        while True:
+            item = await model_pool.run(next, events, end, admitted=True)
+            if item is end:
+                return
+            yield item
+
+    # A client that disconnects stops the iteration; dropping the generator
+    # then cancels its queued sentences
+    return StreamingResponse(messages(), media_type='text/event-stream', headers=STREAM_HEADERS)
+
+
+async def translate_batch(request):
+    data = await read_json(request)
+    return json_response(await pool_for(data, 'sentence').run(translate_batch_response, data))
+
+
+async def health_check(request):
+    payload, status = health_response()
+    payload["pools"] = {pool.name: pool.stats() for pool in (dictionary_pool, model_pool)}
+    return json_response((payload, status))
+
+
+async def readiness_check(request):
+    return json_response(readiness_response())
+
+
+async def reload_resources(request):
+    return json_response(reload_response(request.headers.get('X-Admin-Token'), await read_json(request)))
+
+
+async def metrics(request):
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
+async def index(request):
+    return json_response(api_info_response())
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    dictionary_pool.shutdown()
+    model_pool.shutdown()
+
+
+app = Starlette(
+    routes=[
+        Route('/api/dictionary', get_dictionary_stats, methods=['GET']),
+        Route('/api/suggestions', get_suggestions, methods=['GET']),
+        Route('/api/translate', translate, methods=['POST']),
+        Route('/api/translate/stream', translate_stream, methods=['POST']),
+        Route('/api/translate/batch', translate_batch, methods=['POST']),
+        Route('/api/health', health_check, methods=['GET']),
+        Route('/api/ready', readiness_check, methods=['GET']),
+        Route('/api/admin/reload', reload_resources, methods=['POST']),
+        Route('/metrics', metrics, methods=['GET']),
+        Route('/', index, methods=['GET'])
+    ],
+    middleware=[
+        Middleware(
+            CORSMiddleware,
+            allow_origins=CORS_ORIGINS,
+            allow_methods=CORS_METHODS,
+            allow_headers=['*'],
+            allow_credentials=True
+        )
+    ],
+    exception_handlers={PoolFull: pool_full},
+    lifespan=lifespan
+)
@@ -0,0 +1,212 @@
+"""
+Request coalescing for sentence translation
+
+Flask serves every request on its own thread, so concurrent sentence
+translations would otherwise each run their own generate() call. The
+MicroBatcher collects them for a few milliseconds and hands them to the
+model as one padded batch, then fans the results back out to the waiting
+request threads.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+
+class TranslationFuture(Future):
+    # True when generation was stopped by this request's deadline, so the
+    # translation may be incomplete
+    deadline_exceeded = False
+
+
+class _PendingRequest:
+    __slots__ = ("text", "tokens", "options", "deadline", "key", "future", "enqueued")
+
+    def __init__(self, text, tokens, options, deadline):
+        self.text = text
+        self.tokens = tokens
+        self.options = options
+        self.deadline = deadline
+        self.key = None
+        self.future = TranslationFuture()
+        self.enqueued = time.monotonic()
+
+
+def deadline_bucket(deadline):
+    """Power-of-two bucket of the milliseconds left until deadline (None without one)"""
+    if deadline is None:
+        return None
+    return int(math.log2(max(1.0, (deadline - time.monotonic()) * 1000)))
+
+
+class MicroBatcher:
+    def __init__(self, translate_batch, count_tokens=None, max_wait_ms=5,
+                 max_batch_size=16, max_padded_tokens=2048, batch_key=None):
+        """
+        Batch translation requests on a background thread
+
+        The thread starts with the first submit(), so a batcher created in a
+        pre-fork server's master process runs its thread in each worker.
+
+        Args:
+            translate_batch (callable): Called as translate_batch(texts, **options),
+                must return one translation per text in the same order; gets
+                deadline=... as well when any request in the batch has one
+            count_tokens (callable): Returns the token length of a text, used to
+                keep batches under max_padded_tokens (defaults to word count)
+            max_wait_ms (float): How long the oldest request may wait for others
+            max_batch_size (int): Maximum number of texts per generate() call
+            max_padded_tokens (int): Maximum of batch size x longest input
+            batch_key (callable): Called as batch_key(text, **options); only
+                requests with equal values share a batch (e.g. the output
+                length limit, so a text's translation does not depend on
+                its batchmates)
+        """
+        self.translate_batch = translate_batch
+        self.count_tokens = count_tokens or (lambda text: len(text.split()))
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_padded_tokens = max(1, int(max_padded_tokens))
+        self.batch_key = batch_key or (lambda text, **options: None)
+
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = None
+
+    def submit(self, text, deadline=None, **options):
+        """
+        Queue a text for translation
+
+        Requests are only batched with others that use the same options
+        (e.g. max_length, num_beams) and batch_key, and whose deadline (a time.monotonic()
+        value) is about as far away, within a factor of two. A batch is
+        generated against the earliest deadline among its requests; the
+        requests it cut short before their own deadline are queued again.
+
+        Returns:
+            TranslationFuture: Resolves to the translation, or raises the model
+                error. Cancelling it before its batch starts removes it from
+                the queue.
+        """
+        request = _PendingRequest(text, self.count_tokens(text), tuple(sorted(options.items())), deadline)
+        request.key = (request.options, self.batch_key(text, **options), deadline_bucket(deadline))
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="translation-batcher", daemon=True)
+                self._thread.start()
+            self._pending.append(request)
+            self._cond.notify()
+
+        return request.future
+
+    def translate(self, text, timeout=None, deadline=None, **options):
+        """Translate a single text, blocking until its batch has run"""
+        return self.submit(text, deadline, **options).result(timeout)
+
+    def queue_depth(self):
+        """Number of requests waiting for a batch"""
+        return len(self._pending)
+
+    def close(self):
+        """Stop accepting requests; already queued requests are still served"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _padded_tokens(self, requests):
+        if not requests:
+            return 0
+        return len(requests) * max(r.tokens for r in requests)
+
+    def _batch_full(self, key):
+        compatible = [r for r in self._pending if r.key == key]
+        if len(compatible) >= self.max_batch_size:
+            return True
+        return self._padded_tokens(compatible) >= self.max_padded_tokens
+
+    def _take_batch(self):
+        """Wait for the next batch, or return None once closed and drained"""
+        with self._cond:
+            while not self._pending:
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+            oldest = self._pending[0]
+            deadline = oldest.enqueued + self.max_wait
+
+            # Give concurrent requests a moment to join the oldest one
+            while not self._closed and not self._batch_full(oldest.key):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = []
+            skipped = deque()
+            while self._pending and len(batch) < self.max_batch_size:
+                request = self._pending.popleft()
+                if request.future.cancelled():
+                    continue
+                if request.key != oldest.key:
+                    skipped.append(request)
+                    continue
+                if batch and self._padded_tokens(batch + [request]) > self.max_padded_tokens:
+                    self._pending.appendleft(request)
+                    break
+                # Callers may cancel() a queued request, e.g. when their deadline
+                # passes; requests queued again by _run() are already running
+                if request.future.running() or request.future.set_running_or_notify_cancel():
+                    batch.append(request)
+
+            # Requests with other options or deadlines keep their place at the front
+            self._pending.extendleft(reversed(skipped))
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            if not batch:
+                continue
+
+            options = dict(batch[0].options)
+            deadlines = [r.deadline for r in batch if r.deadline is not None]
+            if deadlines:
+                options["deadline"] = min(deadlines)
+            try:
+                results = self.translate_batch([r.text for r in batch], **options)
+                if len(results) != len(batch):
+                    raise RuntimeError(f"Expected {len(batch)} translations, got {len(results)}")
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            now = time.monotonic()
+            retry = []
+            for request, result in zip(batch, results):
+                if "deadline" in options and now >= options["deadline"]:
+                    if now < request.deadline:
+                        # Cut short by a batchmate's earlier deadline; translate
+                        # it again with the time it has left
+                        retry.append(request)
+                        continue
+                    request.future.deadline_exceeded = True
+                request.future.set_result(result)
+
+            if retry:
+                with self._cond:
+                    for request in retry:
+                        request.key = request.key[:2] + (deadline_bucket(request.deadline),)
+                    self._pending.extendleft(reversed(retry))
+                    self._cond.notify()
@@ -0,0 +1,352 @@
+"""
+Load test: replay a realistic traffic mix against the translation API
+
+Starts the API in-process (Flask, or the ASGI app with --server asgi) on a
+free local port, then replays a seeded mix of sessions from concurrent
+clients:
+
+    suggest   - a word typed keystroke by keystroke, one GET /api/suggestions
+                per prefix (from 2 characters, as the Translator page does)
+    word      - POST /api/translate of a single word
+    sentence  - POST /api/translate of a sentence
+
+Words and sentences are drawn from processed_dataset/*.csv. Throughput and
+p50/p95/p99 latency are reported per endpoint and written to a JSON file;
+with --baseline, the run fails if any endpoint got slower than a previous
+result by more than --tolerance.
+
+--stub-model replaces the model with a stand-in that sleeps in proportion
+to the longest input of each batch, so the request path (batching, cache,
+admission control, segmentation) can be load tested without weights.
+
+Usage:
+    python benchmark_api.py --stub-model --sessions 500 --concurrency 16
+    python benchmark_api.py --model-path ./en-om-model --baseline benchmark_results/before.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import re
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.client import HTTPConnection
+from urllib.parse import urlencode
+
+import pandas as pd
+
+ENDPOINTS = ("suggestions", "translate_word", "translate_sentence")
+
+
+class StubTranslator:
+    """Stands in for EnglishToOromoTranslator: echoes its input after a simulated generate() delay"""
+
+    revision = "stub"
+    backend = "stub"
+
+    def __init__(self, batch_ms=20.0, token_ms=2.0):
+        self.batch_ms = batch_ms
+        self.token_ms = token_ms
+
+    def count_tokens(self, text, max_length=128):
+        return min(len(text.split()) + 1, max_length)
+
+    def generate_batch(self, texts, max_length=128, num_beams=4, length_ratio=None, length_offset=0, deadline=None):
+        # Decoding takes one step per output token, so a batch costs about
+        # as much as its longest input however many texts it holds
+        longest = max((self.count_tokens(t, max_length) for t in texts), default=0)
+        delay = (self.batch_ms + self.token_ms * longest) / 1000.0
+        if deadline is not None:
+            delay = min(delay, max(0.0, deadline - time.monotonic()))
+        time.sleep(delay)
+        return list(texts)
+
+
+def load_corpus(pattern):
+    """English sentences and the distinct words in them, from the parallel corpus CSVs"""
+    sentences = []
+    for path in sorted(glob.glob(pattern)):
+        sentences.extend(pd.read_csv(path)["en"].dropna().astype(str))
+    if not sentences:
+        sys.exit(f"No sentences found in {pattern}")
+
+    words = sorted({w.lower() for s in sentences for w in re.findall(r"[A-Za-z]{3,}", s)})
+    return sentences, words
+
+
+def plan_sessions(count, mix, sentences, words, rng):
+    """The same sequence of sessions for the same seed and corpus"""
+    kinds, weights = zip(*mix.items())
+    sessions = []
+    for kind in rng.choices(kinds, weights, k=count):
+        if kind == "sentence":
+            sessions.append((kind, rng.choice(sentences)))
+        else:
+            sessions.append((kind, rng.choice(words)))
+    return sessions
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in ("suggest", "word", "sentence"):
+            raise argparse.ArgumentTypeError(f"unknown session type: {kind}")
+        mix[kind] = float(weight)
+    return mix
+
+
+def free_port(host):
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+def configure_environment(args):
+    """Settings read by config.py when the app is imported"""
+    os.environ.setdefault("RELOAD_WATCH_INTERVAL", "0")
+    if args.stub_model:
+        os.environ["MODEL_LOADING"] = "off"
+    else:
+        os.environ["MODEL_LOADING"] = "eager"
+        os.environ["MODEL_PATH"] = os.path.abspath(args.model_path)
+
+
+def install_stub_model(api, args):
+    """Serve model requests with a StubTranslator behind the usual micro-batcher"""
+    from batching import MicroBatcher
+    from config import TranslationConfig
+    from reloading import ModelRevision
+
+    translator = StubTranslator(args.stub_batch_ms, args.stub_token_ms)
+    batcher = MicroBatcher(
+        translator.generate_batch,
+        count_tokens=translator.count_tokens,
+        max_wait_ms=TranslationConfig.BATCH_MAX_WAIT_MS,
+        max_batch_size=TranslationConfig.BATCH_MAX_SIZE,
+        max_padded_tokens=TranslationConfig.BATCH_MAX_PADDED_TOKENS
+    )
+    if api.translation_cache is None:
+        api.open_translation_cache()
+    api.runtime.model = ModelRevision(translator, batcher)
+    api.runtime.model_state = "loaded"
+
+
+def start_server(args):
+    """Start the API in a background thread; returns (port, stop)"""
+    import app as api
+
+    if args.stub_model:
+        install_stub_model(api, args)
+    elif api.runtime.model is None:
+        sys.exit(f"No model loaded from {args.model_path} (use --stub-model to run without weights)")
+
+    host = "127.0.0.1"
+    if args.server == "asgi":
+        import uvicorn
+        from asgi import app as asgi_app
+
+        server = uvicorn.Server(uvicorn.Config(asgi_app, host=host, port=free_port(host), log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+        port = server.config.port
+
+        def stop():
+            server.should_exit = True
+            thread.join()
+    else:
+        from werkzeug.serving import make_server
+
+        server = make_server(host, 0, api.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_port
+        stop = server.shutdown
+
+    return port, stop
+
+
+class Client:
+    def __init__(self, port, timeout):
+        """Sends requests and records (endpoint, status, seconds) for each"""
+        self.port = port
+        self.timeout = timeout
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def request(self, endpoint, method, path, body=None):
+        connection = HTTPConnection("127.0.0.1", self.port, timeout=self.timeout)
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        start = time.perf_counter()
+        try:
+            connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except OSError:
+            status = 0
+        finally:
+            connection.close()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.samples.append((endpoint, status, elapsed))
+
+    def run_session(self, session, keystroke_ms=0):
+        kind, text = session
+        if kind == "suggest":
+            for end in range(2, len(text) + 1):
+                self.request("suggestions", "GET", "/api/suggestions?" + urlencode({"q": text[:end], "lang": "english"}))
+                if keystroke_ms:
+                    time.sleep(keystroke_ms / 1000.0)
+        elif kind == "word":
+            self.request("translate_word", "POST", "/api/translate", {"text": text, "type": "word"})
+        else:
+            self.request("translate_sentence", "POST", "/api/translate", {"text": text, "type": "sentence"})
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, wall_seconds):
+    results = {}
+    for endpoint in ENDPOINTS:
+        latencies = sorted(s for e, status, s in samples if e == endpoint)
+        if not latencies:
+            continue
+        statuses = {}
+        for e, status, _ in samples:
+            if e == endpoint:
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+        results[endpoint] = {
+            "requests": len(latencies),
+            "errors": sum(n for status, n in statuses.items() if not status.startswith("2")),
+            "statuses": statuses,
+            "throughput_rps": round(len(latencies) / wall_seconds, 2),
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+            "max_ms": round(latencies[-1] * 1000, 3)
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Regressions of p95 latency or throughput beyond tolerance, as printable lines"""
+    regressions = []
+    for endpoint, current in results["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(endpoint)
+        if not before:
+            continue
+        if current["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {before['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms")
+        if current["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{endpoint}: throughput {before['throughput_rps']:.1f} -> {current['throughput_rps']:.1f} req/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", choices=("flask", "asgi"), default="flask")
+    parser.add_argument("--stub-model", action="store_true", help="Run without model weights")
+    parser.add_argument("--stub-batch-ms", type=float, default=20.0, help="Stub model cost per batch")
+    parser.add_argument("--stub-token-ms", type=float, default=2.0, help="Stub model cost per token of the longest input")
+    parser.add_argument("--model-path", default="./en-om-model")
+    parser.add_argument("--data", default="processed_dataset/*.csv")
+    parser.add_argument("--sessions", type=int, default=500, help="Sessions to replay")
+    parser.add_argument("--warmup", type=int, default=20, help="Sessions replayed before measuring")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--mix", type=parse_mix, default="suggest=0.6,word=0.25,sentence=0.15",
+                        help="Relative weights of the session types")
+    parser.add_argument("--keystroke-ms", type=float, default=0, help="Pause between keystrokes of a suggest session")
+    parser.add_argument("--timeout", type=float, default=60, help="Client timeout per request, in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON results file (default: benchmark_results/api-<time>.json)")
+    parser.add_argument("--baseline", default=None, help="Earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sentences, words = load_corpus(args.data)
+    warmup = plan_sessions(args.warmup, args.mix, sentences, words, rng)
+    sessions = plan_sessions(args.sessions, args.mix, sentences, words, rng)
+
+    print(f"\nLoad testing the {args.server} app ({'stub model' if args.stub_model else args.model_path})")
+    print(f"{len(sessions)} sessions from {len(sentences)} sentences, {len(words)} words, "
+          f"{args.concurrency} concurrent clients")
+
+    configure_environment(args)
+    port, stop = start_server(args)
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(Client(port, args.timeout).run_session, warmup))
+
+        client = Client(port, args.timeout)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(lambda s: client.run_session(s, args.keystroke_ms), sessions))
+        wall_seconds = time.perf_counter() - start
+
+        from app import health_response
+        server_stats = health_response()[0]
+    finally:
+        stop()
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "server": args.server,
+        "model": "stub" if args.stub_model else os.path.abspath(args.model_path),
+        "settings": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "platform": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "wall_seconds": round(wall_seconds, 3),
+        "endpoints": summarize(client.samples, wall_seconds),
+        "cache": server_stats.get("cache"),
+        "admission": server_stats.get("admission")
+    }
+
+    print("\n" + "=" * 78)
+    print(f"{'endpoint':<20}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for endpoint, r in results["endpoints"].items():
+        print(f"{endpoint:<20}{r['requests']:>9}{r['errors']:>8}{r['throughput_rps']:>9.1f}"
+              f"{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['max_ms']:>9.2f}")
+    print("=" * 78)
+    print(f"Wall time: {wall_seconds:.2f}s")
+    if results["cache"]:
+        print(f"Translation cache hit ratio: {results['cache']['hit_ratio']:.2f}")
+
+    output = args.output or os.path.join(
+        "benchmark_results", f"api-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results saved to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n❌ Slower than {args.baseline}:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"\n✅ No regressions vs {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
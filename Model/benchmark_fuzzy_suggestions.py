@@ -0,0 +1,115 @@
+"""
+Latency benchmark: FuzzyIndex vs difflib.get_close_matches
+
+Builds synthetic dictionaries of realistic-looking words (sampled from a
+character bigram model of the parallel corpus), then times misspelled
+lookups against both implementations.
+
+Usage:
+    python benchmark_fuzzy_suggestions.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import time
+from collections import Counter, defaultdict
+from difflib import get_close_matches
+
+from config import TranslationConfig
+from word_index import FuzzyIndex, load_word_frequencies
+
+
+def char_model(corpus_files):
+    """Character bigram transition counts over the corpus vocabulary"""
+    transitions = defaultdict(Counter)
+    for word in load_word_frequencies(*corpus_files):
+        padded = f"^{word}$"
+        for a, b in zip(padded, padded[1:]):
+            transitions[a][b] += 1
+    return {a: (list(c), list(c.values())) for a, c in transitions.items()}
+
+
+def synthetic_words(model, count, rng):
+    words = set()
+    while len(words) < count:
+        word, char = "", "^"
+        while len(word) <= 20:
+            chars, weights = model[char]
+            char = rng.choices(chars, weights)[0]
+            if char == "$":
+                break
+            word += char
+        # Drop run-on words rather than truncating them, which would pile
+        # an unrealistic share of the dictionary up at one length
+        if 2 <= len(word) <= 20:
+            words.add(word)
+    return sorted(words)
+
+
+def misspell(word, rng, alphabet):
+    chars = list(word)
+    for _ in range(rng.randint(1, 2)):
+        pos = rng.randrange(len(chars))
+        op = rng.random()
+        if op < 0.33 and len(chars) > 2:
+            del chars[pos]
+        elif op < 0.66:
+            chars.insert(pos, rng.choice(alphabet))
+        else:
+            chars[pos] = rng.choice(alphabet)
+    return "".join(chars)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda p: samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+    return pick(0.50), pick(0.95), pick(0.99)
+
+
+def time_queries(fn, queries):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--baseline-queries", type=int, default=20,
+                        help="difflib is too slow to time every query on large dictionaries")
+    parser.add_argument("--max-distance", type=int, default=TranslationConfig.FUZZY_MAX_DISTANCE)
+    parser.add_argument("--min-query-length", type=int, default=TranslationConfig.FUZZY_MIN_QUERY_LENGTH,
+                        help="Shorter queries get no matches (0 matches every query)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    model = char_model(TranslationConfig.ENGLISH_CORPUS_FILES)
+    alphabet = [c for c in model if c not in "^$"]
+
+    print(f"{'words':>9}{'build s':>9}  {'index p50/p95/p99 ms':>24}  {'difflib p50/p95/p99 ms':>26}")
+    for size in args.sizes:
+        words = synthetic_words(model, size, rng)
+        queries = [misspell(rng.choice(words), rng, alphabet) for _ in range(args.queries)]
+
+        start = time.perf_counter()
+        index = FuzzyIndex(words, max_distance=args.max_distance, min_query_length=args.min_query_length)
+        build_seconds = time.perf_counter() - start
+
+        fuzzy = time_queries(lambda q: index.close_matches(q, n=5, cutoff=0.6), queries)
+        baseline = time_queries(
+            lambda q: get_close_matches(q, words, n=5, cutoff=0.6),
+            queries[:args.baseline_queries]
+        )
+
+        print(f"{size:>9}{build_seconds:>9.1f}  "
+              f"{'/'.join(f'{v:.2f}' for v in fuzzy):>24}  "
+              f"{'/'.join(f'{v:.1f}' for v in baseline):>26}")
+
+
+if __name__ == "__main__":
+    main()
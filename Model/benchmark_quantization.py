@@ -0,0 +1,118 @@
+"""
+Quality and latency comparison: float32 model vs dynamic int8 quantization
+
+Translates processed_dataset/test.csv one sentence at a time with each
+variant, the way the API serves interactive requests. It reports BLEU and
+chrF against the references, per-sentence latency and peak RSS. Each
+variant runs in its own process so their memory use does not mix.
+
+Usage:
+    pip install sacrebleu
+    python benchmark_quantization.py --limit 100
+"""
+
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import sacrebleu
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(p * len(samples)))]
+
+
+def run_variant(model_path, quantized, texts, max_length, num_beams):
+    """Load one model variant and translate texts one by one (runs in a fresh process)"""
+    from translator import EnglishToOromoTranslator
+
+    start = time.perf_counter()
+    translator = EnglishToOromoTranslator(model_path, quantized=quantized)
+    load_seconds = time.perf_counter() - start
+    loaded_rss = peak_rss_mb()
+
+    # Warm up so the first measured call does not pay one-off allocation costs
+    translator.translate(texts[0], max_length, num_beams)
+
+    hypotheses, latencies = [], []
+    for text in texts:
+        start = time.perf_counter()
+        hypotheses.append(translator.translate(text, max_length, num_beams) or "")
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "hypotheses": hypotheses,
+        "latencies": latencies,
+        "load_seconds": load_seconds,
+        "loaded_rss_mb": loaded_rss,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-path", default="./en-om-model")
+    parser.add_argument("--data", default="processed_dataset/test.csv")
+    parser.add_argument("--limit", type=int, default=None, help="Only use the first N sentences")
+    parser.add_argument("--num-beams", type=int, default=4)
+    parser.add_argument("--max-length", type=int, default=128)
+    args = parser.parse_args()
+
+    data = pd.read_csv(args.data)
+    if args.limit:
+        data = data.head(args.limit)
+    texts = data["en"].astype(str).tolist()
+    references = data["om"].astype(str).tolist()
+
+    print(f"\nComparing float32 and int8 on {len(texts)} sentences from {args.data}")
+
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for name, quantized in (("float32", False), ("int8", True)):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results[name] = pool.submit(
+                run_variant, args.model_path, quantized, texts, args.max_length, args.num_beams
+            ).result()
+
+    for result in results.values():
+        result["bleu"] = sacrebleu.corpus_bleu(result["hypotheses"], [references]).score
+        result["chrf"] = sacrebleu.corpus_chrf(result["hypotheses"], [references]).score
+
+    format_mb = lambda value: f"{value:.0f}" if value is not None else "n/a"
+
+    print("\n" + "=" * 78)
+    print(f"{'variant':<10}{'BLEU':>8}{'chrF':>8}{'p50 ms':>10}{'p99 ms':>10}"
+          f"{'load s':>9}{'RSS loaded MB':>15}{'RSS peak MB':>13}")
+    for name, result in results.items():
+        latencies = result["latencies"]
+        print(f"{name:<10}{result['bleu']:>8.2f}{result['chrf']:>8.2f}"
+              f"{percentile(latencies, 0.50) * 1000:>10.1f}{percentile(latencies, 0.99) * 1000:>10.1f}"
+              f"{result['load_seconds']:>9.1f}{format_mb(result['loaded_rss_mb']):>15}"
+              f"{format_mb(result['peak_rss_mb']):>13}")
+    print("=" * 78)
+
+    base, quant = results["float32"], results["int8"]
+    identical = sum(a == b for a, b in zip(base["hypotheses"], quant["hypotheses"]))
+    print(f"BLEU delta: {quant['bleu'] - base['bleu']:+.2f}")
+    print(f"chrF delta: {quant['chrf'] - base['chrf']:+.2f}")
+    print(f"p50 speedup: {percentile(base['latencies'], 0.50) / percentile(quant['latencies'], 0.50):.2f}x")
+    print(f"Identical outputs: {identical}/{len(texts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Throughput benchmark: bucketed translate_batch vs one translate() per text
+
+Usage:
+    python benchmark_translate_batch.py --limit 100
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from translator import EnglishToOromoTranslator
+
+
+def time_it(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-path", default="./en-om-model")
+    parser.add_argument("--data", default="processed_dataset/test.csv")
+    parser.add_argument("--limit", type=int, default=None, help="Only use the first N sentences")
+    parser.add_argument("--num-beams", type=int, default=4)
+    parser.add_argument("--max-length", type=int, default=128)
+    parser.add_argument("--max-batch-tokens", type=int, default=2048)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    texts = pd.read_csv(args.data)["en"].astype(str).tolist()
+    if args.limit:
+        texts = texts[:args.limit]
+
+    translator = EnglishToOromoTranslator(args.model_path)
+    total_tokens = sum(translator.count_tokens(t, args.max_length) for t in texts)
+
+    print(f"\nBenchmarking {len(texts)} sentences ({total_tokens} source tokens) from {args.data}")
+
+    # Warm up so the first measured call does not pay one-off allocation costs
+    translator.translate(texts[0], args.max_length, args.num_beams)
+
+    looped, loop_seconds = time_it(lambda: [
+        translator.translate(t, args.max_length, args.num_beams) for t in texts
+    ])
+    batched, batch_seconds = time_it(lambda: translator.translate_batch(
+        texts, args.max_length, args.num_beams,
+        max_batch_tokens=args.max_batch_tokens,
+        max_batch_size=args.max_batch_size
+    ))
+
+    matching = sum(a == b for a, b in zip(looped, batched))
+
+    print("\n" + "=" * 50)
+    print(f"{'mode':<12}{'seconds':>10}{'sent/s':>10}{'tok/s':>10}")
+    for name, seconds in (("loop", loop_seconds), ("batched", batch_seconds)):
+        print(f"{name:<12}{seconds:>10.2f}{len(texts) / seconds:>10.2f}{total_tokens / seconds:>10.1f}")
+    print("=" * 50)
+    print(f"Speedup: {loop_seconds / batch_seconds:.2f}x")
+    print(f"Identical outputs: {matching}/{len(texts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -42,4 +42,108 @@ class Config:
 
     # Ensure directories exist
     os.makedirs(DATASET_DIR, exist_ok=True)
-    os.makedirs(MODEL_DIR, exist_ok=True)
\ No newline at end of file
+    os.makedirs(MODEL_DIR, exist_ok=True)
+
+class TranslationConfig:
+    # Settings for the translation API (app.py), overridable via environment
+
+    # Request coalescing for sentence translation (see batching.py)
+    BATCH_MAX_WAIT_MS = float(os.environ.get('BATCH_MAX_WAIT_MS', 5))
+    BATCH_MAX_SIZE = int(os.environ.get('BATCH_MAX_SIZE', 16))
+    BATCH_MAX_PADDED_TOKENS = int(os.environ.get('BATCH_MAX_PADDED_TOKENS', 2048))
+
+    # Decoding profiles, chosen per request with "profile" in the
+    # /api/translate payload. Generation stops at length_ratio x input tokens
+    # + length_offset new tokens (see translator.output_length), and after
+    # DECODING_DEADLINES_MS it returns the best hypothesis so far
+    DECODING_PROFILES = {
+        # Greedy search for interactive chat
+        'interactive': {'max_length': 128, 'num_beams': 1, 'length_ratio': 1.5, 'length_offset': 10},
+        # Beam search for course content and other batch translations
+        'batch': {'max_length': 256, 'num_beams': 4, 'length_ratio': 2.0, 'length_offset': 10}
+    }
+    DECODING_DEADLINES_MS = {
+        'interactive': int(os.environ.get('INTERACTIVE_DEADLINE_MS', 3000)),
+        'batch': int(os.environ.get('BATCH_DEADLINE_MS', 30000))
+    }
+    DEFAULT_PROFILE = os.environ.get('DEFAULT_DECODING_PROFILE', 'interactive')
+    DEFAULT_BATCH_PROFILE = os.environ.get('DEFAULT_BATCH_DECODING_PROFILE', 'batch')
+
+    # Texts are translated sentence by sentence (see segmentation.py); longer
+    # sentences are cut into segments of at most this many words
+    MAX_SEGMENT_WORDS = int(os.environ.get('MAX_SEGMENT_WORDS', 60))
+
+    # Admission control for model-backed sentence translations (see
+    # admission.py). A request that waits longer than MODEL_MAX_QUEUE_WAIT_MS
+    # for one of MODEL_MAX_IN_FLIGHT slots is shed: 'fallback' answers with
+    # the word-by-word dictionary translation (flagged "degraded"), 'reject'
+    # with 503 and Retry-After: MODEL_RETRY_AFTER_S
+    MODEL_MAX_IN_FLIGHT = int(os.environ.get('MODEL_MAX_IN_FLIGHT', 32))
+    MODEL_MAX_QUEUE_WAIT_MS = int(os.environ.get('MODEL_MAX_QUEUE_WAIT_MS', 1000))
+    MODEL_OVERLOAD_POLICY = os.environ.get('MODEL_OVERLOAD_POLICY', 'fallback')
+    MODEL_RETRY_AFTER_S = int(os.environ.get('MODEL_RETRY_AFTER_S', 2))
+
+    # Worker pools of the ASGI app (asgi.py, see worker_pools.py). Requests
+    # beyond a pool's queue bound get 503. Model workers are at least
+    # BATCH_MAX_SIZE so concurrent requests can fill a micro-batch
+    ASGI_MODEL_WORKERS = int(os.environ.get('ASGI_MODEL_WORKERS', 16))
+    ASGI_MODEL_QUEUE = int(os.environ.get('ASGI_MODEL_QUEUE', 64))
+    ASGI_DICTIONARY_WORKERS = int(os.environ.get('ASGI_DICTIONARY_WORKERS', 4))
+    ASGI_DICTIONARY_QUEUE = int(os.environ.get('ASGI_DICTIONARY_QUEUE', 1024))
+
+    # POST /api/translate/batch
+    BULK_MAX_TEXTS = int(os.environ.get('BULK_MAX_TEXTS', 1000))
+    BULK_DEFAULT_DEADLINE_MS = int(os.environ.get('BULK_DEFAULT_DEADLINE_MS', 30000))
+    BULK_MAX_DEADLINE_MS = int(os.environ.get('BULK_MAX_DEADLINE_MS', 120000))
+    BULK_DOCUMENT_FIELDS = ['title', 'description', 'content']
+
+    # Translation cache (see translation_cache.py); set TRANSLATION_CACHE_PATH
+    # to a sqlite file to keep entries across restarts
+    CACHE_MAX_ENTRIES = int(os.environ.get('TRANSLATION_CACHE_MAX_ENTRIES', 10000))
+    CACHE_TTL_SECONDS = float(os.environ.get('TRANSLATION_CACHE_TTL_SECONDS', 0))
+    CACHE_PATH = os.environ.get('TRANSLATION_CACHE_PATH', '')
+
+    # Corpora used to rank /api/suggestions completions by word frequency
+    CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'datasets')
+    ENGLISH_CORPUS_FILES = [os.path.join(CORPUS_DIR, 'eng.txt')]
+    BORANA_CORPUS_FILES = [os.path.join(CORPUS_DIR, 'orm.txt')]
+
+    # Largest edit distance for "did you mean" suggestions (see word_index.FuzzyIndex)
+    FUZZY_MAX_DISTANCE = int(os.environ.get('FUZZY_MAX_DISTANCE', 2))
+    # Shorter queries get no "did you mean" suggestions: the bigram filter cannot
+    # prune them, so each would be compared with every word of a similar length
+    FUZZY_MIN_QUERY_LENGTH = int(os.environ.get('FUZZY_MIN_QUERY_LENGTH', 2 * FUZZY_MAX_DISTANCE))
+
+    # Dictionary source entries and their compiled, memory-mapped form
+    DICTIONARY_SOURCE = os.environ.get('DICTIONARY_SOURCE', os.path.join(CORPUS_DIR, 'dictionary.tsv'))
+    DICTIONARY_PATH = os.environ.get('DICTIONARY_PATH', os.path.join(CORPUS_DIR, 'dictionary.bin'))
+
+    # Model folder loaded by the API
+    MODEL_PATH = os.environ.get('MODEL_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'en-om-model'))
+
+    # Inference backend: 'torch' (EnglishToOromoTranslator) or 'onnx'
+    # (onnx_backend.OnnxTranslator, exported on first use); ONNX_NUM_THREADS
+    # limits onnxruntime's threads per process (0 = one per core)
+    MODEL_BACKEND = os.environ.get('MODEL_BACKEND', 'torch')
+    ONNX_NUM_THREADS = int(os.environ.get('ONNX_NUM_THREADS', 0))
+
+    # Serve the dynamic int8 quantized model (see quantization.py); compare it
+    # with benchmark_quantization.py before enabling it. Torch backend only
+    MODEL_QUANTIZED = os.environ.get('MODEL_QUANTIZED', '0') == '1'
+
+    # How the model is loaded when app.py is imported: 'background' serves
+    # dictionary translations while the model loads (GET /api/ready turns
+    # 200 once it is done), 'eager' blocks until loaded, 'off' never loads it.
+    # 'preload' is 'eager' for pre-fork servers, set by gunicorn.conf.py
+    MODEL_LOADING = os.environ.get('MODEL_LOADING', 'background')
+
+    # Hot reload: POST /api/admin/reload needs X-Admin-Token == ADMIN_TOKEN
+    # (disabled when unset); RELOAD_WATCH_INTERVAL > 0 also polls the
+    # dictionary source and model folder for changes every N seconds
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+    RELOAD_WATCH_INTERVAL = float(os.environ.get('RELOAD_WATCH_INTERVAL', 0))
+    # With a watcher running, the endpoint writes its reload request to this
+    # file and every process's watcher reloads on it, so all workers of a
+    # pre-fork server reload, not just the one that got the request (set by
+    # gunicorn.conf.py)
+    RELOAD_TRIGGER_PATH = os.environ.get('RELOAD_TRIGGER_PATH', '')
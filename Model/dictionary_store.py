@@ -0,0 +1,286 @@
+"""
+Compact, memory-mapped English <-> Borana dictionary
+
+Entries are maintained in one tab-separated source file (english, borana,
+type) and compiled into a binary file that every worker process maps
+read-only, so the operating system shares its pages between workers and
+RSS stays flat as the lexicon grows. Both lookup directions are derived
+from the same entries, and so are the autocomplete and "did you mean"
+indexes (word_index.py), whose arrays are compiled into the same file
+with completions weighted by the corpus files.
+
+Compiled layout (native-endian arrays, 8-byte aligned):
+    header           magic, byte-order mark, (offset, length) per section
+    string offsets   start of each interned UTF-8 string, plus end marker
+    string data      every distinct string, stored once
+    entries          (english, borana, type) string ids per entry
+    per direction    sorted headword string ids, posting starts, entry ids,
+                     then the PrefixIndex and FuzzyIndex arrays
+
+Usage:
+    python dictionary_store.py datasets/dictionary.tsv datasets/dictionary.bin [datasets/eng.txt datasets/orm.txt]
+"""
+
+import csv
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Mapping, Sequence
+
+from word_index import FuzzyIndex, PrefixIndex, load_word_frequencies
+
+MAGIC = b"EODICT02"
+BYTE_ORDER_MARK = 0x01020304
+INDEX_ARRAYS = {**PrefixIndex.ARRAYS, **FuzzyIndex.ARRAYS}
+
+# Section name -> array typecode, in file order
+SECTIONS = {
+    "string_offsets": "I", "string_data": "B", "entries": "I",
+    **{
+        f"{direction}_{name}": typecode
+        for direction in ("english", "borana")
+        for name, typecode in {"keys": "I", "starts": "I", "postings": "I", **INDEX_ARRAYS}.items()
+    }
+}
+HEADER = struct.Struct("=8sI" + "QQ" * len(SECTIONS))
+
+# Source column and response field for each lookup direction
+DIRECTIONS = {"english": ("english", "borana"), "borana": ("borana", "english")}
+
+
+def read_entries(source_path):
+    """Read (english, borana, type) rows from the tab-separated source file"""
+    with open(source_path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f, delimiter="\t")
+        return [
+            (row["english"].strip().lower(), row["borana"].strip().lower(), row["type"].strip())
+            for row in reader
+            if row.get("english") and row.get("borana")
+        ]
+
+
+def compile_dictionary(source_path, output_path, corpus_files=None):
+    """
+    Compile the source entries into the memory-mappable format
+
+    Args:
+        source_path (str): Tab-separated source file
+        output_path (str): Compiled file to write
+        corpus_files (dict): "english"/"borana" -> corpus text files whose word
+            frequencies rank completions (alphabetical when missing)
+    """
+    corpus_files = corpus_files or {}
+    entries = list(dict.fromkeys(read_entries(source_path)))
+
+    string_ids = {}
+    def intern(value):
+        if value not in string_ids:
+            string_ids[value] = len(string_ids)
+        return string_ids[value]
+
+    entry_ids = array("I")
+    for english, borana, word_type in entries:
+        entry_ids.extend((intern(english), intern(borana), intern(word_type)))
+
+    string_data = bytearray()
+    string_offsets = array("I")
+    for value in string_ids:
+        string_offsets.append(len(string_data))
+        string_data += value.encode("utf-8")
+    string_offsets.append(len(string_data))
+
+    sections = {
+        "string_offsets": string_offsets.tobytes(),
+        "string_data": bytes(string_data),
+        "entries": entry_ids.tobytes()
+    }
+
+    for direction, column in (("english", 0), ("borana", 1)):
+        # Postings keep source order, so the first-listed sense stays first
+        postings_by_word = {}
+        for entry_id, entry in enumerate(entries):
+            postings_by_word.setdefault(entry[column], []).append(entry_id)
+
+        # Headwords are already lowercased and unique, so the suggestion
+        # indexes below number them in the same order as the keys
+        words = sorted(postings_by_word)
+        keys, starts, postings = array("I"), array("I"), array("I")
+        for word in words:
+            keys.append(string_ids[word])
+            starts.append(len(postings))
+            postings.extend(postings_by_word[word])
+        starts.append(len(postings))
+
+        sections[f"{direction}_keys"] = keys.tobytes()
+        sections[f"{direction}_starts"] = starts.tobytes()
+        sections[f"{direction}_postings"] = postings.tobytes()
+
+        weights = load_word_frequencies(*corpus_files.get(direction, ()))
+        index_arrays = {**PrefixIndex(words, weights).arrays(), **FuzzyIndex(words).arrays()}
+        for name, values in index_arrays.items():
+            sections[f"{direction}_{name}"] = values.tobytes()
+
+    layout = []
+    offset = HEADER.size
+    for name in SECTIONS:
+        offset += -offset % 8
+        layout.extend((offset, len(sections[name])))
+        offset += len(sections[name])
+
+    # Write to a temporary file and rename, so workers never map a partial file
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, BYTE_ORDER_MARK, *layout))
+            for name, section_offset in zip(SECTIONS, layout[::2]):
+                f.write(b"\0" * (section_offset - f.tell()))
+                f.write(sections[name])
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return len(entries)
+
+
+class Headwords(Sequence):
+    """Sorted headwords of one direction, decoded on access"""
+
+    def __init__(self, store, keys):
+        self._store = store
+        self._keys = keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __getitem__(self, index):
+        return self._store.string(self._keys[index])
+
+
+class DictionaryDirection(Mapping):
+    """Read-only headword -> translations mapping for one direction"""
+
+    def __init__(self, store, direction):
+        self._store = store
+        self.direction = direction
+        self._target = DIRECTIONS[direction][1]
+        self._keys = store._section(f"{direction}_keys")
+        self._starts = store._section(f"{direction}_starts")
+        self._postings = store._section(f"{direction}_postings")
+        self.headwords = Headwords(store, self._keys)
+        # Arrays for PrefixIndex.from_arrays() / FuzzyIndex.from_arrays()
+        self.index_arrays = {name: store._section(f"{direction}_{name}") for name in INDEX_ARRAYS}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        for string_id in self._keys:
+            yield self._store.string(string_id)
+
+    def __getitem__(self, word):
+        index = self._find(word)
+        if index is None:
+            raise KeyError(word)
+
+        entries = self._store._entries
+        results = []
+        for entry_id in self._postings[self._starts[index]:self._starts[index + 1]]:
+            english, borana, word_type = entries[3 * entry_id:3 * entry_id + 3]
+            translation = borana if self._target == "borana" else english
+            results.append({
+                self._target: self._store.string(translation),
+                "type": self._store.string(word_type)
+            })
+        return results
+
+    def _find(self, word):
+        """Binary search over the sorted headwords"""
+        lo, hi = 0, len(self._keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._store.string(self._keys[mid]) < word:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._keys) and self._store.string(self._keys[lo]) == word:
+            return lo
+        return None
+
+
+class DictionaryStore:
+    def __init__(self, path):
+        """Memory-map a compiled dictionary file"""
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self.revision = hashlib.sha256(self._mmap).hexdigest()[:12]
+
+        magic, byte_order, *layout = HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled dictionary")
+        if byte_order != BYTE_ORDER_MARK:
+            raise ValueError(f"{path} was compiled on a machine with a different byte order")
+
+        self._layout = dict(zip(SECTIONS, zip(layout[::2], layout[1::2])))
+        self._string_offsets = self._section("string_offsets")
+        self._string_data = self._section("string_data")
+        self._entries = self._section("entries")
+
+        self.english = DictionaryDirection(self, "english")
+        self.borana = DictionaryDirection(self, "borana")
+
+    def _section(self, name):
+        offset, length = self._layout[name]
+        return self._view[offset:offset + length].cast(SECTIONS[name])
+
+    def string(self, string_id):
+        start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+        return str(self._string_data[start:end], "utf-8")
+
+    def __len__(self):
+        return len(self._entries) // 3
+
+    def as_dict(self):
+        """The {"english_to_borana": ..., "borana_to_english": ...} view used by app.py"""
+        return {"english_to_borana": self.english, "borana_to_english": self.borana}
+
+
+def is_stale(compiled_path, *input_paths):
+    """Whether the compiled file is missing, in an older format, or older than an input file"""
+    try:
+        with open(compiled_path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return True
+        compiled_mtime = os.path.getmtime(compiled_path)
+    except OSError:
+        return True
+    return any(os.path.exists(path) and os.path.getmtime(path) > compiled_mtime for path in input_paths)
+
+
+def open_dictionary(source_path, compiled_path, corpus_files=None):
+    """Map the compiled dictionary, recompiling first if the source or a corpus file is newer"""
+    corpus_paths = [path for paths in (corpus_files or {}).values() for path in paths]
+    if is_stale(compiled_path, source_path, *corpus_paths):
+        compile_dictionary(source_path, compiled_path, corpus_files)
+    return DictionaryStore(compiled_path)
+
+
+def main():
+    if len(sys.argv) not in (3, 5):
+        print(__doc__)
+        sys.exit(1)
+
+    corpus_files = {"english": [sys.argv[3]], "borana": [sys.argv[4]]} if len(sys.argv) == 5 else None
+    count = compile_dictionary(sys.argv[1], sys.argv[2], corpus_files)
+    print(f"✅ Compiled {count} entries into {sys.argv[2]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Gunicorn settings for the translation API
+
+    cd Model && gunicorn
+
+The model is loaded once in the master process (preload_app) and the
+workers forked from it share its weights copy-on-write, so N workers cost
+roughly one copy of the model plus each worker's own activations. Settings
+are overridable via environment:
+
+    PORT                 Port to bind (default 5001)
+    WEB_CONCURRENCY      Worker processes (default 2)
+    GUNICORN_THREADS     Request threads per worker (default 4)
+    TORCH_NUM_THREADS    Torch threads per worker (default: CPUs / workers)
+    ONNX_NUM_THREADS     onnxruntime threads per worker (same default)
+
+Each worker polls for reloads every RELOAD_WATCH_INTERVAL seconds
+(default 5 here), and POST /api/admin/reload writes its request to a
+trigger file (RELOAD_TRIGGER_PATH, default: one per master in the temp
+directory) that all of them poll, so every worker reloads, not just the
+one that received the request. With RELOAD_WATCH_INTERVAL=0 the endpoint
+only reloads the worker that receives it.
+
+Reloading the model gives each worker its own private copy; restart
+gunicorn to share weights again.
+With MODEL_BACKEND=onnx, each worker creates its own onnxruntime sessions
+(their thread pools do not survive a fork), so the weights are not shared.
+"""
+
+import gc
+import os
+import tempfile
+
+# Load the model eagerly at import; init_worker() does the per-process setup
+os.environ.setdefault("MODEL_LOADING", "preload")
+
+# Let an admin reload reach every worker (see app.reload_response)
+os.environ.setdefault("RELOAD_WATCH_INTERVAL", "5")
+os.environ.setdefault("RELOAD_TRIGGER_PATH", os.path.join(tempfile.gettempdir(), f"translation-reload-{os.getpid()}.json"))
+
+wsgi_app = "app:app"
+preload_app = True
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5001)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+
+# Concurrent requests within a worker are coalesced by the MicroBatcher
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+timeout = 120
+
+# Split the CPUs between workers instead of every worker using all of them
+torch_threads = int(os.environ.get("TORCH_NUM_THREADS", max(1, (os.cpu_count() or 1) // workers)))
+os.environ.setdefault("ONNX_NUM_THREADS", str(torch_threads))
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the garbage collector's reach, so
+    # collections in the workers do not write to (and copy) shared pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    import app
+    app.init_worker(num_threads=torch_threads)
+
+
+def on_exit(server):
+    try:
+        os.remove(os.environ["RELOAD_TRIGGER_PATH"])
+    except OSError:
+        pass
@@ -0,0 +1,153 @@
+"""
+Prometheus metrics for the translation API
+
+A minimal, dependency-free registry of counters, histograms and
+callback gauges, rendered in the Prometheus text format at GET /metrics.
+Stage timings (tokenize, generate, decode), dictionary lookups and
+suggestions are recorded where they happen; queue depths and cache
+statistics are read when the endpoint is scraped.
+
+Metrics are kept per process: with several gunicorn workers, each worker
+reports its own, so scrape them individually or aggregate by instance.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; from sub-millisecond dictionary lookups to beam searches
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_metrics = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        """A monotonically increasing count, optionally split by labels"""
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, buckets=LATENCY_BUCKETS, labels=()):
+        """Observations counted into cumulative buckets, optionally split by labels"""
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    labels = _format_labels(self.labels, key, [("le", _format_value(bound))])
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labels, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric:
+    def __init__(self, name, help, function, type="gauge", labels=()):
+        """
+        A gauge (or counter) read from function() at scrape time
+
+        function returns a number, or with labels a dict mapping label
+        value tuples to numbers; None leaves the metric out.
+        """
+        self.name = name
+        self.help = help
+        self.function = function
+        self.type = type
+        self.labels = tuple(labels)
+        _metrics.append(self)
+
+    def render(self):
+        value = self.function()
+        if value is None:
+            return []
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        values = value if self.labels else {(): value}
+        for key, sample in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(sample)}")
+        return lines
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# Model inference, recorded by the translators (translator.py, onnx_backend.py)
+TOKENIZE_SECONDS = Histogram(
+    "translation_tokenize_seconds", "Time to tokenize a model batch", labels=("backend",))
+GENERATE_SECONDS = Histogram(
+    "translation_generate_seconds", "Time to generate translations for a model batch", labels=("backend",))
+DECODE_SECONDS = Histogram(
+    "translation_decode_seconds", "Time to detokenize a model batch", labels=("backend",))
+BATCH_SIZE = Histogram(
+    "translation_batch_size", "Texts per model batch", buckets=BATCH_SIZE_BUCKETS, labels=("backend",))
@@ -1,154 +1,506 @@
-from transformers import MarianMTModel, MarianTokenizer, Seq2SeqTrainer, Seq2SeqTrainingArguments, DataCollatorForSeq2Seq
-from datasets import Dataset, DatasetDict
-import pandas as pd
+"""
+Fine-tune a MarianMT model on the English-Oromo parallel corpus
+
+Usage:
+    python model_training.py
+    python model_training.py --resume              # continue from the latest checkpoint
+    python model_training.py --save-steps 200 --epochs 5
+    python model_training.py --cpu-profile         # threads, bf16, gradient accumulation
+
+Checkpoints (with optimizer and scheduler state) are written to
+--output-dir every --save-steps batches; --resume picks up from the latest
+one. On SIGTERM the current step finishes, a checkpoint is saved and the
+process exits, so preempted runs lose at most one step. The final model
+is only written to --model-dir once training completes.
+"""
+
+from transformers import (
+    DataCollatorForSeq2Seq,
+    MarianMTModel,
+    MarianTokenizer,
+    Seq2SeqTrainer,
+    Seq2SeqTrainingArguments,
+    TrainerCallback
+)
+from transformers.trainer_utils import get_last_checkpoint
+from datasets import Dataset, DatasetDict, load_from_disk
+import argparse
+import hashlib
+import os
+import random
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 import torch
+from torch.utils.data import DataLoader
+
+BASE_MODEL = "Helsinki-NLP/opus-mt-en-ROMANCE"  # Base model for fine-tuning
+CHECKPOINT_DIR = "./en-om-mt-model"
+MODEL_DIR = "./en-om-model"
+
+# Parallel corpus files: CSV, Parquet or Arrow/Feather, with "en" and "om" columns
+TRAIN_DATA = os.environ.get("TRAIN_DATA", "processed_dataset/train.csv")
+VAL_DATA = os.environ.get("VAL_DATA", "processed_dataset/val.csv")
+
+MAX_LENGTH = 128
+
+# Batch training examples by padded token count instead of a fixed number
+# of sentences (0 keeps per_device_train_batch_size)
+MAX_BATCH_TOKENS = int(os.environ.get("TRAIN_MAX_BATCH_TOKENS", 0))
+
+# Tokenized datasets are saved here, one folder per fingerprint of the
+# tokenizer, MAX_LENGTH and corpus files ("" disables the cache)
+TOKENIZED_CACHE_DIR = os.environ.get("TOKENIZED_CACHE_DIR", "./tokenized-cache")
+TOKENIZE_NUM_PROC = int(os.environ.get("TOKENIZE_NUM_PROC", os.cpu_count() or 1))
+
+# --cpu-profile defaults: one intra-op thread per available core, bf16
+# autocast if the CPU has native bf16 instructions, and gradients
+# accumulated over 8 batches (an effective batch of 8 x --batch-size)
+CPU_PROFILE_GRADIENT_ACCUMULATION = 8
+
+# Bump when preprocess_function changes, so cached datasets are rebuilt
+PREPROCESS_VERSION = 1
+
+def read_parallel_table(path):
+    """Read the en/om columns of a corpus file into an Arrow table of strings"""
+    columns = ["en", "om"]
+    extension = os.path.splitext(path)[1].lower()
+    
+    if extension == ".parquet":
+        table = pq.read_table(path, columns=columns)
+    elif extension in (".arrow", ".feather"):
+        table = feather.read_table(path, columns=columns)
+    else:
+        # Multi-threaded parser; empty cells stay empty strings as with str(row[...])
+        table = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types={column: pa.string() for column in columns}
+        ))
+    
+    return table.select(columns).cast(pa.schema([(column, pa.string()) for column in columns]))
+
+def table_to_dataset(table):
+    """Wrap the en/om columns into the {"translation": {"en", "om"}} struct column without copying rows"""
+    translation = pa.StructArray.from_arrays(
+        [table.column("en").combine_chunks(), table.column("om").combine_chunks()],
+        names=["en", "om"]
+    )
+    return Dataset(pa.table({"translation": translation}))
 
-# ✅ 1. Load data from CSV files
 def load_csv_data(train_path, val_path):
-    """Load CSV data and convert to HuggingFace Dataset format"""
-    # Load CSV files
-    train_df = pd.read_csv(train_path)
-    val_df = pd.read_csv(val_path)
-    
-    # Convert to the format expected by the model
-    def df_to_dataset(df):
-        data = []
-        for _, row in df.iterrows():
-            data.append({
-                "translation": {
-                    "en": str(row["en"]),
-                    "om": str(row["om"])
-                }
-            })
-        return Dataset.from_list(data)
+    """
+    Load the training and validation corpus as a HuggingFace DatasetDict
     
+    Files may be CSV, Parquet (.parquet) or Arrow/Feather (.arrow, .feather).
+    Columns are converted to the translation struct in Arrow, so loading
+    stays fast and memory-light for corpora of millions of lines.
+    """
     return DatasetDict({
-        "train": df_to_dataset(train_df),
-        "validation": df_to_dataset(val_df)
+        "train": table_to_dataset(read_parallel_table(train_path)),
+        "validation": table_to_dataset(read_parallel_table(val_path))
     })
 
-# Load the data
-data = load_csv_data("processed_dataset/train.csv", "processed_dataset/val.csv")
+class TokenBudgetBatchSampler:
+    def __init__(self, lengths, max_tokens, max_batch_size=None, seed=42):
+        """
+        Batches of similar-length examples whose padded size stays within a token budget
+        
+        Examples are sorted by length (ties in random order) and cut into
+        batches so that batch size x longest example <= max_tokens: short
+        sentences travel in large batches, long ones in small batches. The
+        batches are fixed; their order is reshuffled every epoch.
+        
+        Args:
+            lengths (list): Token length of each example
+            max_tokens (int): Padded tokens per batch
+            max_batch_size (int): Optional cap on examples per batch
+        """
+        rng = np.random.default_rng(seed)
+        lengths = np.asarray(lengths)
+        shuffled = rng.permutation(len(lengths))
+        order = shuffled[np.argsort(lengths[shuffled], kind="stable")]
+        
+        self.batches = []
+        batch, longest = [], 0
+        for index in order.tolist():
+            length = int(lengths[index])
+            full = max_batch_size and len(batch) >= max_batch_size
+            if batch and (full or max(longest, length) * (len(batch) + 1) > max_tokens):
+                self.batches.append(batch)
+                batch, longest = [], 0
+            batch.append(index)
+            longest = max(longest, length)
+        if batch:
+            self.batches.append(batch)
+        
+        self.seed = seed
+        self.epoch = 0
+    
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+    
+    def __iter__(self):
+        batches = random.Random(self.seed + self.epoch).sample(self.batches, len(self.batches))
+        self.epoch += 1
+        return iter(batches)
+    
+    def __len__(self):
+        return len(self.batches)
+
+class StopOnSignal(TrainerCallback):
+    def __init__(self, signals=(signal.SIGTERM,)):
+        """Save a checkpoint and stop training after the current step when the process is signalled"""
+        self.received = None
+        self._previous = {signum: signal.signal(signum, self._handle) for signum in signals}
+    
+    def _handle(self, signum, frame):
+        print(f"\n⚠️  Received {signal.Signals(signum).name}, saving a checkpoint after this step...")
+        self.received = signum
+    
+    def on_step_end(self, args, state, control, **kwargs):
+        if self.received is not None:
+            control.should_save = True
+            control.should_training_stop = True
+        return control
+    
+    def restore(self):
+        """Reinstall the signal handlers that were active before"""
+        for signum, handler in self._previous.items():
+            signal.signal(signum, handler)
 
-print(f"Training examples: {len(data['train'])}")
-print(f"Validation examples: {len(data['validation'])}")
-print(f"Sample training example: {data['train'][0]}")
+class TranslationTrainer(Seq2SeqTrainer):
+    def __init__(self, *args, max_batch_tokens=0, **kwargs):
+        """
+        Seq2SeqTrainer that can batch training examples by token budget (see
+        TokenBudgetBatchSampler) and counts the real (unpadded) tokens it trains on
+        """
+        super().__init__(*args, **kwargs)
+        self.max_batch_tokens = max_batch_tokens
+        self.tokens_seen = 0
+        self.eval_seconds = 0.0
+    
+    def training_step(self, model, inputs, *args, **kwargs):
+        self.tokens_seen += int(inputs["attention_mask"].sum()) + int((inputs["labels"] != -100).sum())
+        return super().training_step(model, inputs, *args, **kwargs)
+    
+    def evaluate(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().evaluate(*args, **kwargs)
+        finally:
+            self.eval_seconds += time.perf_counter() - start
+    
+    def get_train_dataloader(self):
+        if not self.max_batch_tokens:
+            return super().get_train_dataloader()
+        
+        sampler = TokenBudgetBatchSampler(
+            self.train_dataset["length"], self.max_batch_tokens, seed=self.args.seed
+        )
+        return self.accelerator.prepare(DataLoader(
+            self.train_dataset,
+            batch_sampler=sampler,
+            collate_fn=self.data_collator,
+            num_workers=self.args.dataloader_num_workers,
+            pin_memory=self.args.dataloader_pin_memory
+        ))
 
-#  2. Load pre-trained MarianMT model & tokenizer
-model_name = "Helsinki-NLP/opus-mt-en-ROMANCE"  # Base model for fine-tuning
-tokenizer = MarianTokenizer.from_pretrained(model_name)
-model = MarianMTModel.from_pretrained(model_name)
+def tokenizer_revision(tokenizer):
+    """Fingerprint of the tokenizer's vocabulary files and settings"""
+    digest = hashlib.sha256()
+    with tempfile.TemporaryDirectory() as directory:
+        tokenizer.save_pretrained(directory)
+        for name in sorted(os.listdir(directory)):
+            digest.update(name.encode("utf-8"))
+            with open(os.path.join(directory, name), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
 
-# Add special tokens for Oromo if needed (optional)
-# tokenizer.add_tokens(["<om>", "</om>"])
-# model.resize_token_embeddings(len(tokenizer))
+def tokenized_data_fingerprint(tokenizer, max_length, source_files):
+    """
+    Cache key for a tokenized corpus
+    
+    Corpus files are identified by path, size and modification time (like
+    translator.model_revision), so the key is cheap even for large corpora.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{PREPROCESS_VERSION}:{tokenizer_revision(tokenizer)}:{max_length}".encode("utf-8"))
+    for path in source_files:
+        stat = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()[:16]
 
-print(f"Model loaded: {model_name}")
-print(f"Tokenizer vocab size: {len(tokenizer)}")
+def tokenize_data(tokenizer, train_path, val_path, max_length=MAX_LENGTH, cache_dir=TOKENIZED_CACHE_DIR):
+    """
+    Load and tokenize the corpus, or reuse the tokenized copy from an earlier run
+    
+    Tokenization runs in up to TOKENIZE_NUM_PROC processes (one per 10k
+    training examples, so small corpora skip the process start-up).
+    """
+    cache_path = None
+    if cache_dir:
+        fingerprint = tokenized_data_fingerprint(tokenizer, max_length, [train_path, val_path])
+        cache_path = os.path.join(cache_dir, fingerprint)
+        if os.path.isdir(cache_path):
+            print(f"Loading tokenized data from {cache_path}")
+            return load_from_disk(cache_path)
+    
+    data = load_csv_data(train_path, val_path)
+    print(f"Training examples: {len(data['train'])}")
+    print(f"Validation examples: {len(data['validation'])}")
+    print(f"Sample training example: {data['train'][0]}")
+    
+    num_proc = min(TOKENIZE_NUM_PROC, max(1, len(data["train"]) // 10000))
+    print(f"Preprocessing data ({num_proc} process{'es' if num_proc > 1 else ''})...")
+    tokenized = data.map(
+        preprocess_function,
+        batched=True,
+        remove_columns=data["train"].column_names,
+        fn_kwargs={"tokenizer": tokenizer, "max_length": max_length},
+        num_proc=num_proc if num_proc > 1 else None
+    )
+    
+    if cache_path:
+        # Save under a temporary name so an interrupted run leaves no partial cache
+        partial_path = f"{cache_path}.partial"
+        shutil.rmtree(partial_path, ignore_errors=True)
+        tokenized.save_to_disk(partial_path)
+        os.replace(partial_path, cache_path)
+        print(f"Tokenized data cached in {cache_path}")
+    return tokenized
 
-#  3. Preprocessing function
-def preprocess_function(examples, max_length=128):
-    """Preprocess the translation examples"""
+def preprocess_function(examples, tokenizer, max_length=MAX_LENGTH):
+    """
+    Tokenize the translation examples without padding
+    
+    The data collator pads each batch to its longest example (labels with
+    -100, ignored by the loss). "length" is used to group examples of
+    similar length into batches.
+    """
     # Extract source and target texts
     sources = [ex["en"] for ex in examples["translation"]]
     targets = [ex["om"] for ex in examples["translation"]]
     
-    # Tokenize source texts
     model_inputs = tokenizer(
-        sources, 
-        max_length=max_length, 
-        truncation=True, 
-        padding="max_length"
+        sources,
+        text_target=targets,
+        max_length=max_length,
+        truncation=True
     )
-    
-    # Tokenize target texts
-    with tokenizer.as_target_tokenizer():
-        labels = tokenizer(
-            targets, 
-            max_length=max_length, 
-            truncation=True, 
-            padding="max_length"
-        )
-    
-    # Replace padding token id's in labels with -100 (ignored by loss function)
-    labels["input_ids"] = [
-        [(l if l != tokenizer.pad_token_id else -100) for l in label] 
-        for label in labels["input_ids"]
+    model_inputs["length"] = [
+        max(len(source), len(target))
+        for source, target in zip(model_inputs["input_ids"], model_inputs["labels"])
     ]
-    
-    model_inputs["labels"] = labels["input_ids"]
     return model_inputs
 
-# Apply preprocessing
-print("Preprocessing data...")
-tokenized_data = data.map(
-    preprocess_function, 
-    batched=True, 
-    remove_columns=data["train"].column_names
-)
+def cpu_supports_bf16():
+    """Whether the CPU has native bfloat16 instructions (AVX512-BF16 or AMX); Linux only"""
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
 
-print("Data preprocessing completed!")
-
-#  4. Training arguments
-training_args = Seq2SeqTrainingArguments(
-    output_dir="./en-om-mt-model",
-    eval_strategy="epoch",  # Changed from evaluation_strategy
-    learning_rate=3e-5,
-    per_device_train_batch_size=4,  # Reduced batch size to avoid memory issues
-    per_device_eval_batch_size=4,
-    weight_decay=0.01,
-    save_total_limit=2,
-    num_train_epochs=10,
-    predict_with_generate=True,
-    logging_dir="./logs",
-    logging_steps=50,
-    save_strategy="epoch",
-    load_best_model_at_end=True,
-    metric_for_best_model="eval_loss",
-    greater_is_better=False,
-    warmup_steps=100,
-    fp16=torch.cuda.is_available(),  # Use mixed precision if GPU available
-    dataloader_pin_memory=False,
-    remove_unused_columns=False,
-    report_to=[],  # Disable wandb and other reporting
-)
+def available_cores():
+    """Cores this process may run on (respects container CPU sets)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
 
-#  5. Data collator
-data_collator = DataCollatorForSeq2Seq(
-    tokenizer=tokenizer,
-    model=model,
-    padding=True
-)
+def configure_threads(intra_op_threads=None, inter_op_threads=None):
+    """Set torch's thread pools; must run before torch starts any parallel work"""
+    if intra_op_threads:
+        torch.set_num_threads(intra_op_threads)
+    if inter_op_threads:
+        try:
+            torch.set_num_interop_threads(inter_op_threads)
+        except RuntimeError:
+            print("⚠️  Inter-op threads can only be set before torch starts parallel work")
+    print(f"CPU threads: {torch.get_num_threads()} intra-op, {torch.get_num_interop_threads()} inter-op")
 
-#  6. Initialize trainer
-trainer = Seq2SeqTrainer(
-    model=model,
-    args=training_args,
-    train_dataset=tokenized_data["train"],
-    eval_dataset=tokenized_data["validation"],
-    tokenizer=tokenizer,
-    data_collator=data_collator,
-)
+def load_model(base_model=BASE_MODEL):
+    """Load the pre-trained MarianMT model and tokenizer to fine-tune"""
+    tokenizer = MarianTokenizer.from_pretrained(base_model)
+    model = MarianMTModel.from_pretrained(base_model)
+    
+    # Add special tokens for Oromo if needed (optional)
+    # tokenizer.add_tokens(["<om>", "</om>"])
+    # model.resize_token_embeddings(len(tokenizer))
+    
+    print(f"Model loaded: {base_model}")
+    print(f"Tokenizer vocab size: {len(tokenizer)}")
+    return tokenizer, model
 
-print("Trainer initialized. Starting training...")
+def build_training_args(output_dir, epochs, batch_size, learning_rate, save_steps, save_total_limit,
+                        gradient_accumulation_steps=1, bf16=False, torch_compile=False):
+    """
+    Seq2SeqTrainingArguments; with save_steps, checkpoints (and evaluations,
+    which pick the best model) happen every save_steps batches instead of
+    every epoch
+    """
+    schedule = {"eval_strategy": "epoch", "save_strategy": "epoch"}
+    if save_steps:
+        # The trainer counts optimizer steps, each gradient_accumulation_steps
+        # batches, so accumulation does not make checkpoints rarer
+        steps = max(1, save_steps // gradient_accumulation_steps)
+        schedule = {"eval_strategy": "steps", "eval_steps": steps, "save_strategy": "steps", "save_steps": steps}
+    
+    return Seq2SeqTrainingArguments(
+        output_dir=output_dir,
+        learning_rate=learning_rate,
+        per_device_train_batch_size=batch_size,
+        group_by_length=True,  # Batch sentences of similar length to minimise padding
+        per_device_eval_batch_size=batch_size,
+        gradient_accumulation_steps=gradient_accumulation_steps,
+        weight_decay=0.01,
+        save_total_limit=save_total_limit,
+        num_train_epochs=epochs,
+        predict_with_generate=True,
+        logging_dir="./logs",
+        logging_steps=50,
+        load_best_model_at_end=True,
+        metric_for_best_model="eval_loss",
+        greater_is_better=False,
+        warmup_steps=100,
+        fp16=torch.cuda.is_available() and not bf16,  # Use mixed precision if GPU available
+        bf16=bf16,  # bfloat16 autocast (on CPU, or on a GPU with --bf16 on)
+        use_cpu=bf16 and not torch.cuda.is_available(),  # Required for bf16 without a GPU
+        torch_compile=torch_compile,
+        dataloader_pin_memory=False,
+        remove_unused_columns=False,  # "length" is dropped by the data collator
+        report_to=[],  # Disable wandb and other reporting
+        **schedule
+    )
 
-#  7. Train the model
-try:
-    trainer.train()
+def save_final_model(model, tokenizer, model_dir):
+    """
+    Write the model beside model_dir and then swap it in, so an API
+    watching the folder never loads a half-written model
+    """
+    model_dir = os.path.normpath(model_dir)
+    staging, previous = f"{model_dir}.saving", f"{model_dir}.previous"
+    shutil.rmtree(staging, ignore_errors=True)
+    model.save_pretrained(staging)
+    tokenizer.save_pretrained(staging)
+    
+    if os.path.isdir(model_dir):
+        shutil.rmtree(previous, ignore_errors=True)
+        os.replace(model_dir, previous)
+    os.replace(staging, model_dir)
+    shutil.rmtree(previous, ignore_errors=True)
+
+def train(train_data=TRAIN_DATA, val_data=VAL_DATA, base_model=BASE_MODEL, output_dir=CHECKPOINT_DIR,
+          model_dir=MODEL_DIR, epochs=10, batch_size=4, learning_rate=3e-5, max_batch_tokens=MAX_BATCH_TOKENS,
+          save_steps=500, save_total_limit=2, resume=None, cpu_profile=False, threads=None,
+          interop_threads=None, bf16=None, gradient_accumulation_steps=None, torch_compile=False):
+    """
+    Fine-tune base_model and save the best checkpoint to model_dir
+    
+    Args:
+        resume (str): Checkpoint folder to resume from, or "latest" for the
+            newest checkpoint in output_dir (if any)
+        cpu_profile (bool): Default threads, bf16 and
+            gradient_accumulation_steps for CPU training (see
+            CPU_PROFILE_GRADIENT_ACCUMULATION); explicit values still win
+        bf16 (str): "on", "off" or "auto" (on if the CPU supports it natively)
+        torch_compile (bool): Compile the model with torch.compile
+    
+    Returns:
+        bool: True if training completed and the model was saved, False if
+            it was stopped by a signal (resume it with resume="latest")
+    """
+    if cpu_profile:
+        # The training step is one chain of dependent ops, so inter-op
+        # threads would only compete with the intra-op pool for cores
+        threads = threads or available_cores()
+        interop_threads = interop_threads or 1
+        bf16 = bf16 or "auto"
+        gradient_accumulation_steps = gradient_accumulation_steps or CPU_PROFILE_GRADIENT_ACCUMULATION
+    configure_threads(threads, interop_threads)
+    
+    use_bf16 = bf16 == "on" or (bf16 == "auto" and not torch.cuda.is_available() and cpu_supports_bf16())
+    if use_bf16:
+        print("Using bfloat16 autocast")
+    
+    tokenizer, model = load_model(base_model)
+    
+    tokenized_data = tokenize_data(tokenizer, train_data, val_data)
+    print(f"Data preprocessing completed! ({len(tokenized_data['train'])} training, "
+          f"{len(tokenized_data['validation'])} validation examples)")
+    
+    seq2seq_collator = DataCollatorForSeq2Seq(
+        tokenizer=tokenizer,
+        model=model,
+        padding=True
+    )
+    
+    def data_collator(features):
+        """Pad each batch to its longest example; "length" is only used for batching"""
+        return seq2seq_collator([{k: v for k, v in f.items() if k != "length"} for f in features])
+    
+    stop_on_signal = StopOnSignal()
+    trainer = TranslationTrainer(
+        model=model,
+        args=build_training_args(
+            output_dir, epochs, batch_size, learning_rate, save_steps, save_total_limit,
+            gradient_accumulation_steps=gradient_accumulation_steps or 1,
+            bf16=use_bf16,
+            torch_compile=torch_compile
+        ),
+        train_dataset=tokenized_data["train"],
+        eval_dataset=tokenized_data["validation"],
+        tokenizer=tokenizer,
+        data_collator=data_collator,
+        callbacks=[stop_on_signal],
+        max_batch_tokens=max_batch_tokens,
+    )
+    
+    checkpoint = None
+    if resume == "latest":
+        checkpoint = get_last_checkpoint(output_dir) if os.path.isdir(output_dir) else None
+        if checkpoint is None:
+            print(f"No checkpoint in {output_dir}, starting from the base model")
+    elif resume:
+        checkpoint = resume
+    
+    print(f"Trainer initialized. {'Resuming from ' + checkpoint if checkpoint else 'Starting training'}...")
+    try:
+        start = time.perf_counter()
+        trainer.train(resume_from_checkpoint=checkpoint)
+        elapsed = time.perf_counter() - start
+    except Exception as e:
+        # Leave model_dir alone; the step checkpoints in output_dir can be resumed
+        print(f"Training error: {e}")
+        print(f"Resume from the last checkpoint in {output_dir} with --resume")
+        raise
+    finally:
+        stop_on_signal.restore()
+    
+    # Source and target tokens, excluding padding and time spent evaluating
+    train_seconds = elapsed - trainer.eval_seconds
+    print(f"Throughput: {trainer.tokens_seen / train_seconds:.0f} tokens/s "
+          f"({trainer.tokens_seen} tokens in {train_seconds:.1f}s of training)")
+    
+    if stop_on_signal.received is not None:
+        print(f"Training stopped at step {trainer.state.global_step}; "
+              f"checkpoint saved in {output_dir}. Resume with --resume")
+        return False
+    
     print("Training completed successfully!")
-except Exception as e:
-    print(f"Training error: {e}")
-    # Save current state even if training fails
-    trainer.save_model("./en-om-model-checkpoint")
-
-#  8. Save the final model
-print("Saving model...")
-model.save_pretrained("./en-om-model")
-tokenizer.save_pretrained("./en-om-model")
-print("Model saved successfully!")
-
-#  9. Test the model with a sample translation
-def test_translation(text, model_path="./en-om-model"):
+    print("Saving model...")
+    save_final_model(trainer.model, tokenizer, model_dir)
+    print(f"Model saved successfully to {model_dir}!")
+    return True
+
+def test_translation(text, model_path=MODEL_DIR):
     """Test the trained model with a sample text"""
     try:
         # Load the saved model
@@ -160,7 +512,7 @@ def test_translation(text, model_path="./en-om-model"):
         
         # Generate translation
         with torch.no_grad():
-            outputs = test_model.generate(**inputs, max_length=128, num_beams=4, early_stopping=True)
+            outputs = test_model.generate(**inputs, max_length=MAX_LENGTH, num_beams=4, early_stopping=True)
         
         # Decode output
         translation = test_tokenizer.decode(outputs[0], skip_special_tokens=True)
@@ -169,10 +521,44 @@ def test_translation(text, model_path="./en-om-model"):
         print(f"Translation test error: {e}")
         return None
 
-# Test with a sample sentence
-sample_text = "Hello, how are you?"
-translation = test_translation(sample_text)
-if translation:
-    print(f"\nSample translation:")
-    print(f"English: {sample_text}")
-    print(f"Oromo: {translation}")
\ No newline at end of file
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--train-data", default=TRAIN_DATA, help="CSV, Parquet or Arrow file")
+    parser.add_argument("--val-data", default=VAL_DATA, help="CSV, Parquet or Arrow file")
+    parser.add_argument("--base-model", default=BASE_MODEL)
+    parser.add_argument("--output-dir", default=CHECKPOINT_DIR, help="Checkpoints")
+    parser.add_argument("--model-dir", default=MODEL_DIR, help="Final model, written when training completes")
+    parser.add_argument("--epochs", type=float, default=10)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--learning-rate", type=float, default=3e-5)
+    parser.add_argument("--max-batch-tokens", type=int, default=MAX_BATCH_TOKENS,
+                        help="Batch by padded token count instead of --batch-size sentences (0 = off)")
+    parser.add_argument("--save-steps", type=int, default=500,
+                        help="Checkpoint and evaluate every N batches, whatever the gradient accumulation (0 = every epoch)")
+    parser.add_argument("--save-total-limit", type=int, default=2, help="Checkpoints kept (plus the best one)")
+    parser.add_argument("--cpu-profile", action="store_true",
+                        help="Tune threads, bf16 and gradient accumulation for CPU training")
+    parser.add_argument("--threads", type=int, default=None, help="Intra-op threads")
+    parser.add_argument("--interop-threads", type=int, default=None, help="Inter-op threads")
+    parser.add_argument("--bf16", choices=("auto", "on", "off"), default=None,
+                        help="bfloat16 autocast instead of fp16 (auto: on CPUs that support it natively)")
+    parser.add_argument("--gradient-accumulation-steps", type=int, default=None,
+                        help="Batches per optimizer step")
+    parser.add_argument("--compile", dest="torch_compile", action="store_true", help="Use torch.compile (compiles are slow and repeat for new input shapes; for long runs)")
+    parser.add_argument("--resume", nargs="?", const="latest", default=None, metavar="CHECKPOINT",
+                        help="Resume from CHECKPOINT, or the latest checkpoint in --output-dir")
+    args = parser.parse_args()
+    
+    if not train(**vars(args)):
+        sys.exit(128 + signal.SIGTERM)
+    
+    # Test with a sample sentence
+    sample_text = "Hello, how are you?"
+    translation = test_translation(sample_text, args.model_dir)
+    if translation:
+        print(f"\nSample translation:")
+        print(f"English: {sample_text}")
+        print(f"Oromo: {translation}")
+
+if __name__ == "__main__":
+    main()
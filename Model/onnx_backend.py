@@ -0,0 +1,472 @@
+"""
+ONNX Runtime backend for the en-om model
+
+Exports en-om-model into three ONNX graphs and decodes them with
+onnxruntime, which has much less per-call overhead than PyTorch eager mode
+for short inputs:
+
+    encoder.onnx              source tokens -> encoder states
+    decoder.onnx              first step: logits and the self/cross-attention cache
+    decoder_with_past.onnx    later steps: one new token against the cache
+
+The graphs are cached next to the model folder (en-om-model ->
+en-om-model-onnx) and re-exported whenever the source model changes.
+Exporting needs PyTorch; running the exported graphs does not:
+
+    python onnx_backend.py ./en-om-model
+
+OnnxTranslator has the same interface as EnglishToOromoTranslator;
+app.py uses it when MODEL_BACKEND=onnx.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import onnxruntime
+
+from metrics import BATCH_SIZE, DECODE_SECONDS, GENERATE_SECONDS, TOKENIZE_SECONDS
+from translator import EnglishToOromoTranslator, model_revision, output_length
+
+ONNX_SUFFIX = "-onnx"
+INFO_NAME = "onnx_export.json"
+OPSET_VERSION = 14
+
+
+def onnx_path(model_path):
+    """Folder holding the ONNX graphs for model_path"""
+    return os.path.normpath(model_path) + ONNX_SUFFIX
+
+
+def cache_info(model_path):
+    """Provenance of an export; only the source revision decides whether it is reused"""
+    import torch
+    import transformers
+
+    return {
+        "source_revision": model_revision(model_path),
+        "torch": torch.__version__,
+        "transformers": transformers.__version__,
+        "opset": OPSET_VERSION
+    }
+
+
+def cache_names(num_layers, prefix, attention=("decoder", "encoder")):
+    """Input/output names of the attention cache, four per layer (self key/value, cross key/value)"""
+    return [
+        f"{prefix}.{layer}.{kind}.{name}"
+        for layer in range(num_layers) for kind in attention for name in ("key", "value")
+    ]
+
+
+def export_onnx(model_path, output_path=None):
+    """Export the encoder and decoder graphs of the model to output_path"""
+    import torch
+    from transformers import MarianMTModel
+    from transformers.cache_utils import EncoderDecoderCache
+
+    output_path = output_path or onnx_path(model_path)
+    os.makedirs(output_path, exist_ok=True)
+
+    # Eager attention traces into plain MatMul/Softmax nodes
+    model = MarianMTModel.from_pretrained(model_path, attn_implementation="eager")
+    model.eval()
+    config = model.config
+    num_layers = config.decoder_layers
+
+    # The wrappers hold the model as a submodule, so its weights are exported as initializers
+    class Graph(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+    class Encoder(Graph):
+        def forward(self, input_ids, attention_mask):
+            return self.model.get_encoder()(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+    class Decoder(Graph):
+        def forward(self, input_ids, encoder_hidden_states, encoder_attention_mask, *past):
+            cache = None
+            if past:
+                cache = EncoderDecoderCache.from_legacy_cache(
+                    tuple(tuple(past[4 * i:4 * i + 4]) for i in range(num_layers))
+                )
+            outputs = self.model.model.decoder(
+                input_ids=input_ids,
+                encoder_hidden_states=encoder_hidden_states,
+                encoder_attention_mask=encoder_attention_mask,
+                past_key_values=cache,
+                use_cache=True,
+                return_dict=True
+            )
+            logits = self.model.lm_head(outputs.last_hidden_state) + self.model.final_logits_bias
+            present = outputs.past_key_values
+            if hasattr(present, "to_legacy_cache"):
+                present = present.to_legacy_cache()
+            # The cross-attention cache never changes, so later steps only return the self-attention one
+            keep = 2 if past else 4
+            return (logits,) + tuple(t for layer in present for t in layer[:keep])
+
+    batch, source_length, past_length = 2, 5, 3
+    input_ids = torch.full((batch, source_length), 5, dtype=torch.long)
+    attention_mask = torch.ones_like(input_ids)
+    encoder_states = torch.zeros(batch, source_length, config.d_model)
+    decoder_ids = torch.full((batch, 1), config.decoder_start_token_id, dtype=torch.long)
+    head_dim = config.d_model // config.decoder_attention_heads
+    past = []
+    for _ in range(num_layers):
+        past += [torch.zeros(batch, config.decoder_attention_heads, past_length, head_dim)] * 2
+        past += [torch.zeros(batch, config.decoder_attention_heads, source_length, head_dim)] * 2
+
+    def cache_axes(names):
+        return {
+            name: {0: "batch", 2: "encoder_sequence" if ".encoder." in name else "past_sequence"}
+            for name in names
+        }
+
+    full_cache = cache_names(num_layers, "present")
+    past_names = cache_names(num_layers, "past_key_values")
+    self_cache = cache_names(num_layers, "present", attention=("decoder",))
+    decoder_inputs = ["input_ids", "encoder_hidden_states", "encoder_attention_mask"]
+    decoder_axes = {
+        "input_ids": {0: "batch"},
+        "encoder_hidden_states": {0: "batch", 1: "encoder_sequence"},
+        "encoder_attention_mask": {0: "batch", 1: "encoder_sequence"},
+        "logits": {0: "batch"}
+    }
+
+    with torch.no_grad():
+        torch.onnx.export(
+            Encoder(), (input_ids, attention_mask), os.path.join(output_path, "encoder.onnx"),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "encoder_sequence"},
+                "attention_mask": {0: "batch", 1: "encoder_sequence"},
+                "last_hidden_state": {0: "batch", 1: "encoder_sequence"}
+            },
+            opset_version=OPSET_VERSION
+        )
+        torch.onnx.export(
+            Decoder(), (decoder_ids, encoder_states, attention_mask),
+            os.path.join(output_path, "decoder.onnx"),
+            input_names=decoder_inputs,
+            output_names=["logits"] + full_cache,
+            dynamic_axes={**decoder_axes, **cache_axes(full_cache)},
+            opset_version=OPSET_VERSION
+        )
+        torch.onnx.export(
+            Decoder(), (decoder_ids, encoder_states, attention_mask, *past),
+            os.path.join(output_path, "decoder_with_past.onnx"),
+            input_names=decoder_inputs + past_names,
+            output_names=["logits"] + self_cache,
+            dynamic_axes={**decoder_axes, **cache_axes(past_names), **cache_axes(self_cache)},
+            opset_version=OPSET_VERSION
+        )
+
+    # Written last, so it marks the export as complete
+    with open(os.path.join(output_path, INFO_NAME), "w") as f:
+        json.dump(cache_info(model_path), f, indent=2)
+
+    return output_path
+
+
+def log_softmax(x):
+    x = x - x.max(axis=-1, keepdims=True)
+    return x - np.log(np.exp(x).sum(axis=-1, keepdims=True))
+
+
+class OnnxTranslator(EnglishToOromoTranslator):
+    def __init__(self, model_path="./en-om-model", num_threads=0):
+        """
+        Translator running the exported ONNX graphs on onnxruntime (CPU)
+
+        Decoding follows model.generate(): the same generation_config.json
+        settings, greedy search for num_beams=1 and beam search with early
+        stopping otherwise.
+
+        Args:
+            model_path (str): Path to your extracted model folder
+            num_threads (int): onnxruntime intra-op threads (0 = one per core)
+        """
+        self.num_threads = num_threads
+        self._sessions = None
+        self._sessions_pid = None
+        self._sessions_lock = threading.Lock()
+        super().__init__(model_path)
+
+    def load_model(self):
+        """Load the tokenizer and the ONNX graphs, exporting them first if needed"""
+        from transformers import GenerationConfig, MarianConfig, MarianTokenizer
+
+        try:
+            self.tokenizer = MarianTokenizer.from_pretrained(self.model_path)
+            self.config = MarianConfig.from_pretrained(self.model_path)
+            self.generation_config = GenerationConfig.from_pretrained(self.model_path)
+            self.onnx_path = onnx_path(self.model_path)
+
+            try:
+                with open(os.path.join(self.onnx_path, INFO_NAME)) as f:
+                    info = json.load(f)
+            except (OSError, ValueError):
+                info = {}
+
+            if info.get("source_revision") != model_revision(self.model_path):
+                print(f"🔧 Exporting {self.model_path} to ONNX in {self.onnx_path}...")
+                export_onnx(self.model_path, self.onnx_path)
+
+            self._create_sessions()
+            self.model = self._sessions["decoder_with_past"]
+            self.revision = model_revision(self.model_path) + ONNX_SUFFIX
+            self.backend = "onnx"
+
+            print(" ONNX model loaded successfully!")
+            print(f"Tokenizer vocab size: {len(self.tokenizer)}")
+
+        except Exception as e:
+            print(f"Error loading ONNX model: {e}")
+            raise
+
+    def _create_sessions(self):
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = self.num_threads
+
+        self._sessions = {
+            name: onnxruntime.InferenceSession(
+                os.path.join(self.onnx_path, f"{name}.onnx"), options, providers=["CPUExecutionProvider"]
+            )
+            for name in ("encoder", "decoder", "decoder_with_past")
+        }
+        self._sessions_pid = os.getpid()
+
+    def _session(self, name):
+        # onnxruntime's thread pool does not survive a fork, so a translator
+        # loaded before a pre-fork server forks recreates its sessions
+        if self._sessions_pid != os.getpid():
+            with self._sessions_lock:
+                if self._sessions_pid != os.getpid():
+                    self._create_sessions()
+        return self._sessions[name]
+
+    def generate_batch(self, texts, max_length=128, num_beams=4,
+                       length_ratio=None, length_offset=0, deadline=None):
+        """
+        Translate a list of texts with one encoder pass and a shared decoding loop
+
+        Inputs are padded to the longest text, so callers should group
+        texts of similar length. Errors are raised rather than swallowed.
+        length_ratio/length_offset and deadline work as in
+        EnglishToOromoTranslator.generate_batch(): greedy rows stop at their
+        own output limit, and beam search runs once per distinct limit.
+
+        Returns:
+            list: Translated Oromo texts, in input order
+        """
+        if not texts:
+            return []
+
+        BATCH_SIZE.observe(len(texts), backend=self.backend)
+        with TOKENIZE_SECONDS.time(backend=self.backend):
+            inputs = self.tokenizer(
+                list(texts),
+                return_tensors="np",
+                padding=True,
+                truncation=True,
+                max_length=max_length
+            )
+        input_ids = inputs["input_ids"].astype(np.int64)
+        attention_mask = inputs["attention_mask"].astype(np.int64)
+
+        with GENERATE_SECONDS.time(backend=self.backend):
+            encoder_states = self._session("encoder").run(
+                None, {"input_ids": input_ids, "attention_mask": attention_mask}
+            )[0]
+
+            limits = np.array([
+                output_length(n, max_length, length_ratio, length_offset)
+                for n in attention_mask.sum(axis=1).tolist()
+            ])
+            if num_beams > 1:
+                groups = [np.flatnonzero(limits == limit) for limit in np.unique(limits)]
+                sequences = [
+                    self._beam_search(encoder_states[rows], attention_mask[rows], int(limits[rows[0]]), num_beams, deadline)
+                    for rows in groups
+                ]
+            else:
+                groups = [np.arange(len(texts))]
+                sequences = [self._greedy_search(encoder_states, attention_mask, limits, deadline)]
+
+        translations = [None] * len(texts)
+        with DECODE_SECONDS.time(backend=self.backend):
+            for rows, group_sequences in zip(groups, sequences):
+                for i, translation in zip(rows, self.tokenizer.batch_decode(group_sequences, skip_special_tokens=True)):
+                    translations[i] = translation
+        return translations
+
+    def _decode_step(self, input_ids, encoder_states, attention_mask, cache):
+        """Run one decoder step; cache is None on the first step"""
+        feed = {
+            "input_ids": input_ids,
+            "encoder_hidden_states": encoder_states,
+            "encoder_attention_mask": attention_mask
+        }
+
+        if cache is None:
+            session = self._session("decoder")
+            outputs = session.run(None, feed)
+            # Per layer: self key, self value, cross key, cross value
+            return outputs[0][:, -1, :], list(outputs[1:])
+
+        session = self._session("decoder_with_past")
+        names = cache_names(self.config.decoder_layers, "past_key_values")
+        feed.update(zip(names, cache))
+        feed = {i.name: feed[i.name] for i in session.get_inputs()}
+        logits, *self_cache = session.run(None, feed)
+
+        # Only the self-attention entries grow; the cross-attention ones are reused
+        for layer in range(self.config.decoder_layers):
+            cache[4 * layer:4 * layer + 2] = self_cache[2 * layer:2 * layer + 2]
+        return logits[:, -1, :], cache
+
+    def _log_probs(self, logits, length, max_length):
+        """
+        Apply the generation_config.json logits processors (as generate() does)
+
+        max_length may also be an array with one limit per row.
+        """
+        config = self.generation_config
+        log_probs = log_softmax(logits.astype(np.float32))
+
+        for ids in config.bad_words_ids or []:
+            if len(ids) == 1:
+                log_probs[:, ids[0]] = -np.inf
+
+        forced_eos = config.forced_eos_token_id
+        if forced_eos is not None:
+            rows = np.broadcast_to(length == np.asarray(max_length) - 1, log_probs.shape[:1])
+            log_probs[rows] = -np.inf
+            log_probs[rows, forced_eos] = 0
+
+        if config.renormalize_logits:
+            log_probs = log_softmax(log_probs)
+        return log_probs
+
+    @staticmethod
+    def _past_deadline(deadline):
+        return deadline is not None and time.monotonic() >= deadline
+
+    def _greedy_search(self, encoder_states, attention_mask, max_lengths, deadline=None):
+        """Greedy search; each row stops at its own entry of max_lengths"""
+        config = self.generation_config
+        batch = encoder_states.shape[0]
+        sequences = np.full((batch, 1), config.decoder_start_token_id, dtype=np.int64)
+        finished = sequences.shape[1] >= np.broadcast_to(max_lengths, (batch,))
+        cache = None
+
+        while not finished.all():
+            logits, cache = self._decode_step(sequences[:, -1:], encoder_states, attention_mask, cache)
+            tokens = self._log_probs(logits, sequences.shape[1], max_lengths).argmax(axis=-1)
+            tokens = np.where(finished, config.pad_token_id, tokens)
+            finished |= tokens == config.eos_token_id
+            sequences = np.concatenate([sequences, tokens[:, None]], axis=1)
+            finished |= sequences.shape[1] >= max_lengths
+            if self._past_deadline(deadline):
+                break
+
+        return sequences
+
+    def _beam_search(self, encoder_states, attention_mask, max_length, num_beams, deadline=None):
+        """Beam search with early stopping, mirroring model.generate()"""
+        config = self.generation_config
+        length_penalty = config.length_penalty
+        batch, beams = encoder_states.shape[0], num_beams
+        candidates = 2 * beams
+
+        encoder_states = np.repeat(encoder_states, beams, axis=0)
+        attention_mask = np.repeat(attention_mask, beams, axis=0)
+
+        running = np.full((batch, beams, max_length), config.pad_token_id, dtype=np.int64)
+        running[:, :, 0] = config.decoder_start_token_id
+        # Only the first beam is live until the first step fans out
+        running_scores = np.zeros((batch, beams), dtype=np.float32)
+        running_scores[:, 1:] = -1e9
+
+        finished = running.copy()
+        finished_scores = np.full((batch, beams), -1e9, dtype=np.float32)
+        is_finished = np.zeros((batch, beams), dtype=bool)
+
+        cache = None
+        length = 1
+        while True:
+            logits, cache = self._decode_step(
+                running[:, :, length - 1].reshape(-1, 1), encoder_states, attention_mask, cache
+            )
+            log_probs = self._log_probs(logits, length, max_length)
+            vocab = log_probs.shape[-1]
+            scores = (log_probs.reshape(batch, beams, vocab) + running_scores[:, :, None]).reshape(batch, -1)
+
+            # Best 2 x beams continuations, so enough stay live after some finish
+            top = np.argpartition(-scores, candidates - 1, axis=1)[:, :candidates]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            top_beams, top_tokens = top // vocab, top % vocab
+            top_sequences = np.take_along_axis(running, top_beams[:, :, None], axis=1)
+            top_sequences[:, :, length] = top_tokens
+            hits_stop = (top_tokens == config.eos_token_id) | (length + 1 >= max_length)
+            # Like generate(max_time=...): at the deadline every candidate stops
+            if self._past_deadline(deadline):
+                hits_stop[:] = True
+
+            # Live beams for the next step: the best candidates that did not stop
+            live_scores = top_scores - hits_stop * np.float32(1e9)
+            keep = np.argsort(-live_scores, axis=1, kind="stable")[:, :beams]
+            running = np.take_along_axis(top_sequences, keep[:, :, None], axis=1)
+            running_scores = np.take_along_axis(live_scores, keep, axis=1)
+            source_beams = np.take_along_axis(top_beams, keep, axis=1)
+
+            # Finished hypotheses: only stopped candidates among the top `beams` count
+            just_finished = hits_stop.copy()
+            just_finished[:, beams:] = False
+            normalized = top_scores / np.float32(length ** length_penalty)
+            normalized -= (is_finished.all(axis=1, keepdims=True) * np.float32(1e9))
+            normalized -= (~just_finished) * np.float32(1e9)
+            merged_scores = np.concatenate([finished_scores, normalized], axis=1)
+            best = np.argsort(-merged_scores, axis=1, kind="stable")[:, :beams]
+            finished = np.take_along_axis(np.concatenate([finished, top_sequences], axis=1), best[:, :, None], axis=1)
+            finished_scores = np.take_along_axis(merged_scores, best, axis=1)
+            is_finished = np.take_along_axis(np.concatenate([is_finished, just_finished], axis=1), best, axis=1)
+
+            # Reorder the self-attention cache to follow the surviving beams
+            rows = (np.arange(batch)[:, None] * beams + source_beams).reshape(-1)
+            for layer in range(self.config.decoder_layers):
+                cache[4 * layer] = cache[4 * layer][rows]
+                cache[4 * layer + 1] = cache[4 * layer + 1][rows]
+
+            length += 1
+            best_running = running_scores[:, :1] / np.float32((length - 1) ** length_penalty)
+            worst_finished = np.where(is_finished, finished_scores.min(axis=1, keepdims=True), -1e9)
+            improvement_possible = (best_running > worst_finished).any()
+            open_beams = not is_finished.all()
+            if not (improvement_possible and open_beams and not hits_stop.all()):
+                break
+
+        return finished[:, 0, :]
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print(__doc__)
+        sys.exit(1)
+
+    output_path = export_onnx(*sys.argv[1:])
+    print(f"✅ ONNX graphs written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Dynamic int8 quantization of the en-om model
+
+The weights of every Linear layer are stored as int8, and activations are
+quantized on the fly at inference time. This roughly quarters the size of
+those weights and speeds up CPU matrix multiplies. The quantized weights
+are cached next to the model folder (en-om-model -> en-om-model-int8) and
+rebuilt whenever the source model or the torch/transformers versions change:
+
+    python quantization.py ./en-om-model
+
+Use benchmark_quantization.py to compare quality and latency before
+enabling it (MODEL_QUANTIZED=1).
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import torch
+import transformers
+from transformers import MarianMTModel
+
+from translator import model_revision
+
+QUANTIZED_SUFFIX = "-int8"
+WEIGHTS_NAME = "quantized_model.pt"
+INFO_NAME = "quantization.json"
+
+
+def quantized_path(model_path):
+    """Folder holding the quantized weights for model_path"""
+    return os.path.normpath(model_path) + QUANTIZED_SUFFIX
+
+
+def quantize(model):
+    """Replace the model's Linear layers with dynamically quantized int8 ones"""
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def cache_info(model_path):
+    """What a cached export must match to be reused"""
+    return {
+        "source_revision": model_revision(model_path),
+        "torch": torch.__version__,
+        "transformers": transformers.__version__,
+        "dtype": "qint8",
+        "modules": ["Linear"]
+    }
+
+
+def export_quantized(model_path, output_path=None):
+    """Quantize the float model and write its weights to output_path"""
+    output_path = output_path or quantized_path(model_path)
+    os.makedirs(output_path, exist_ok=True)
+
+    model = MarianMTModel.from_pretrained(model_path)
+    model.eval()
+    model = quantize(model)
+
+    # The whole module is pickled: loading a state dict instead would need a
+    # float model to quantize first, more than doubling peak memory at startup.
+    # Write to a temporary file and rename, so loaders never see a partial
+    # file; the info file is written last and marks the export as complete
+    fd, temp_path = tempfile.mkstemp(dir=output_path, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            torch.save(model, f)
+        os.replace(temp_path, os.path.join(output_path, WEIGHTS_NAME))
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    with open(os.path.join(output_path, INFO_NAME), "w") as f:
+        json.dump(cache_info(model_path), f, indent=2)
+
+    return output_path
+
+
+def load_quantized(model_path):
+    """Load the quantized model for model_path, exporting it first if the cache is missing or stale"""
+    output_path = quantized_path(model_path)
+
+    try:
+        with open(os.path.join(output_path, INFO_NAME)) as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        info = {}
+
+    if info != cache_info(model_path):
+        print(f"🔧 Quantizing {model_path} into {output_path}...")
+        export_quantized(model_path, output_path)
+
+    # Our own export, so unpickling the module is safe
+    model = torch.load(os.path.join(output_path, WEIGHTS_NAME), weights_only=False)
+    model.eval()
+    return model
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print(__doc__)
+        sys.exit(1)
+
+    output_path = export_quantized(*sys.argv[1:])
+    size = os.path.getsize(os.path.join(output_path, WEIGHTS_NAME)) / 1e6
+    print(f"✅ Quantized model written to {output_path} ({size:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
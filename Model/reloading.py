@@ -0,0 +1,207 @@
+"""
+Versioned, hot-swappable dictionary and model for the translation API
+
+The active dictionary and model are immutable revision objects held by a
+Runtime. A reload builds the new revision in a background thread and swaps
+it in with a single attribute assignment. Request code reads
+runtime.dictionary once (the model through runtime.use_model()) and keeps
+using that object, so in-flight requests finish on the version they started
+with. A replaced model's batcher stops once no request holds it and its
+queued batches are done.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class DictionaryRevision:
+    def __init__(self, entries, indexes, revision):
+        """
+        A loaded dictionary and the suggestion indexes built from it
+
+        Args:
+            entries (dict): {"english_to_borana": ..., "borana_to_english": ...}
+            indexes (dict): Per-language {"prefix": ..., "fuzzy": ...} indexes
+            revision (str): Fingerprint of the dictionary data
+        """
+        self.entries = entries
+        self.indexes = indexes
+        self.revision = revision
+
+
+class ModelRevision:
+    def __init__(self, translator, batcher):
+        """A loaded translator and the batcher that feeds it"""
+        self.translator = translator
+        self.batcher = batcher
+        self.revision = translator.revision
+        self._lock = threading.Lock()
+        self._users = 0
+        self._retired = False
+
+    def acquire(self):
+        """Mark the revision as in use by a request (see Runtime.use_model)"""
+        with self._lock:
+            self._users += 1
+
+    def release(self):
+        with self._lock:
+            self._users -= 1
+            close = self._retired and self._users == 0
+        if close:
+            self.batcher.close()
+
+    def retire(self):
+        """Stop the batcher thread once no request uses the revision and its queued requests are served"""
+        with self._lock:
+            self._retired = True
+            close = self._users == 0
+        if close:
+            self.batcher.close()
+
+
+class Runtime:
+    def __init__(self, load_dictionary, load_model):
+        """
+        Holds the active revisions and reloads them on request
+
+        Args:
+            load_dictionary (callable): Returns a new DictionaryRevision
+            load_model (callable): Returns a new ModelRevision, or None when
+                no model is available
+        """
+        self.dictionary = None
+        self.model = None
+        self._load_dictionary = load_dictionary
+        self._load_model = load_model
+        self._reload_lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._watcher = None
+        self.reloading = False
+        self.last_reload = None
+
+        # "not_loaded", "loading", "loaded", "unavailable" (no model to load),
+        # "failed" or "disabled"; stays "loaded" while a replacement loads
+        self.model_state = "not_loaded"
+
+    def reload(self, dictionary=True, model=True, background=True):
+        """
+        Load new revisions and swap them in
+
+        Only one reload runs at a time; while it loads, requests keep being
+        served by the current revisions. If loading fails, the current
+        revision stays active and the error is recorded in last_reload.
+        """
+        if model and self.model is None:
+            self.model_state = "loading"
+
+        if not background:
+            self._reload(dictionary, model)
+            return
+
+        thread = threading.Thread(
+            target=self._reload, args=(dictionary, model), name="translation-reload", daemon=True
+        )
+        thread.start()
+
+    def _reload(self, dictionary, model):
+        with self._reload_lock:
+            self.reloading = True
+            started = time.time()
+            errors = {}
+
+            if dictionary:
+                try:
+                    self.dictionary = self._load_dictionary()
+                    logger.info(f"Dictionary revision {self.dictionary.revision} active")
+                except Exception as e:
+                    logger.error(f"Dictionary reload failed: {e}")
+                    errors["dictionary"] = str(e)
+
+            if model:
+                if self.model is None:
+                    self.model_state = "loading"
+                try:
+                    new_model = self._load_model()
+                    with self._model_lock:
+                        old_model, self.model = self.model, new_model
+                    self.model_state = "loaded" if new_model else "unavailable"
+                    if new_model:
+                        logger.info(f"Model revision {new_model.revision} active")
+                    if old_model and old_model is not new_model:
+                        old_model.retire()
+                except Exception as e:
+                    logger.error(f"Model reload failed: {e}")
+                    errors["model"] = str(e)
+                    if self.model is None:
+                        self.model_state = "failed"
+
+            self.reloading = False
+            self.last_reload = {
+                "started": started,
+                "seconds": round(time.time() - started, 3),
+                "components": [name for name, wanted in (("dictionary", dictionary), ("model", model)) if wanted],
+                "errors": errors
+            }
+
+    @contextmanager
+    def use_model(self):
+        """
+        The active ModelRevision (None without a model), kept usable until
+        the block exits even if a reload replaces it meanwhile
+        """
+        with self._model_lock:
+            model = self.model
+            if model:
+                model.acquire()
+        try:
+            yield model
+        finally:
+            if model:
+                model.release()
+
+    def watch(self, fingerprints, interval):
+        """
+        Poll for changed files and reload what changed
+
+        Args:
+            fingerprints (callable): Returns {"dictionary": ..., "model": ...}
+                values that change whenever the underlying files change
+            interval (float): Seconds between polls
+        """
+        def poll():
+            previous = fingerprints()
+            while True:
+                time.sleep(interval)
+                try:
+                    current = fingerprints()
+                except Exception as e:
+                    logger.error(f"Reload watcher error: {e}")
+                    continue
+                changed = {name for name in current if current[name] != previous.get(name)}
+                if not changed:
+                    continue
+
+                logger.info(f"Detected changes in {', '.join(sorted(changed))}, reloading")
+                self._reload("dictionary" in changed, "model" in changed)
+
+                # Retry failed components on the next poll (e.g. a half-copied model folder)
+                for name in changed - set(self.last_reload["errors"]):
+                    previous[name] = current[name]
+
+        self._watcher = threading.Thread(target=poll, name="translation-reload-watcher", daemon=True)
+        self._watcher.start()
+
+    def status(self):
+        """Active revisions for /api/health"""
+        return {
+            "dictionary_revision": self.dictionary.revision if self.dictionary else None,
+            "model_revision": self.model.revision if self.model else None,
+            "model_state": self.model_state,
+            "reloading": self.reloading,
+            "last_reload": self.last_reload
+        }
@@ -0,0 +1,93 @@
+"""
+Sentence segmentation for long texts
+
+The model only sees the first max_length tokens of its input, so lesson
+content is split into sentences that are translated separately and put
+back together with the original whitespace between them:
+
+    segments, separators = split_sentences(text)
+    join_sentences([translate(s) for s in segments], separators)
+"""
+
+import re
+
+# Words ending in "." that rarely end a sentence
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "st", "vs", "e.g", "i.e", "no", "jr", "sr", "approx", "fig"}
+
+_WORD = re.compile(r"\S+")
+_SENTENCE_END = re.compile(r"[.!?…]+[\"'”’)\]]*$")
+_CLAUSE_END = re.compile(r"[,;:]$")
+
+
+def _ends_sentence(word, next_word):
+    """Whether the sentence ends after word, given the word that follows it"""
+    match = _SENTENCE_END.search(word)
+    if not match:
+        return False
+    if next_word[0].islower():
+        return False
+    if set(match.group()) == {"."}:
+        stem = word[:match.start()].lstrip("\"'“‘([").lower()
+        # Initials ("J. Smith") and abbreviations ("Dr. Smith")
+        if len(stem) == 1 or stem in ABBREVIATIONS:
+            return False
+    return True
+
+
+def _split_long(start, end, words, max_words):
+    """Cut words[start:end] into runs of at most max_words, preferring clause boundaries"""
+    while end - start > max_words:
+        cut = start + max_words
+        for i in range(cut - 1, start + max_words // 2 - 1, -1):
+            if _CLAUSE_END.search(words[i].group()):
+                cut = i + 1
+                break
+        yield start, cut
+        start = cut
+    yield start, end
+
+
+def split_sentences(text, max_words=None):
+    """
+    Split text into sentences
+
+    Sentences end at ., ! or ? (plus closing quotes and brackets) followed
+    by a word that does not start in lowercase, and at line breaks.
+    Sentences longer than max_words words are cut further, at a comma or
+    semicolon where possible, so no segment is truncated by the model.
+
+    Returns:
+        tuple: (segments, separators) with one more separator than segments,
+            such that separators[0] + segments[0] + separators[1] + ... +
+            segments[-1] + separators[-1] == text
+    """
+    words = list(_WORD.finditer(text))
+    if not words:
+        return [], [text]
+
+    sentences = []
+    start = 0
+    for i in range(len(words) - 1):
+        gap = text[words[i].end():words[i + 1].start()]
+        if "\n" in gap or _ends_sentence(words[i].group(), words[i + 1].group()):
+            sentences.append((start, i + 1))
+            start = i + 1
+    sentences.append((start, len(words)))
+
+    if max_words:
+        sentences = [run for start, end in sentences for run in _split_long(start, end, words, max_words)]
+
+    segments = [text[words[start].start():words[end - 1].end()] for start, end in sentences]
+    separators = [text[:words[0].start()]]
+    separators += [text[words[end - 1].end():words[end].start()] for _, end in sentences[:-1]]
+    separators.append(text[words[-1].end():])
+    return segments, separators
+
+
+def join_sentences(segments, separators):
+    """Reassemble (translated) segments with the separators from split_sentences"""
+    parts = [separators[0]]
+    for segment, separator in zip(segments, separators[1:]):
+        parts.append(segment)
+        parts.append(separator)
+    return "".join(parts)
@@ -0,0 +1,215 @@
+"""
+Content-addressed cache for model translations
+
+Entries are keyed on a hash of the normalized text, translation direction,
+model revision and generation parameters, so a new model or different
+decoding settings never serve stale results. The in-memory layer is a
+bounded LRU with optional TTL; an optional sqlite file keeps entries across
+restarts and can be pre-warmed offline:
+
+    python translation_cache.py --cache translations.sqlite --texts phrases.txt
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_text(text):
+    """Normalize unicode and collapse whitespace, keeping case and punctuation"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(text, direction, revision, params):
+    """Content address of a translation request"""
+    payload = json.dumps(
+        [normalize_text(text), direction, revision, sorted((params or {}).items())],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    def __init__(self, max_entries=10000, ttl_seconds=0, path=None, warm_entries=None):
+        """
+        Create a translation cache
+
+        Args:
+            max_entries (int): Maximum number of entries held in memory
+            ttl_seconds (float): Expire entries after this many seconds (0 = never)
+            path (str): Optional sqlite file backing the memory cache
+            warm_entries (int): Most recent disk entries to load at startup
+                (defaults to max_entries)
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl_seconds
+        self.path = path
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+            self.warm(self.max_entries if warm_entries is None else warm_entries)
+
+    def get(self, text, direction, revision, params=None):
+        """Return the cached translation, or None on a miss"""
+        key = cache_key(text, direction, revision, params)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, created = entry
+                if not self._expired(created):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created FROM translations WHERE key = ?", (key,)
+                ).fetchone()
+                if row and not self._expired(row[1]):
+                    self._store(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, text, direction, revision, params, value):
+        """Cache a translation in memory and, if configured, on disk"""
+        key = cache_key(text, direction, revision, params)
+        created = time.time()
+
+        with self._lock:
+            self._store(key, value, created)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations (key, value, created) VALUES (?, ?, ?)",
+                    (key, value, created)
+                )
+                self._db.commit()
+
+    def warm(self, limit):
+        """Load the most recent disk entries into memory"""
+        if self._db is None or limit <= 0:
+            return 0
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, value, created FROM translations ORDER BY created DESC LIMIT ?",
+                (min(limit, self.max_entries),)
+            ).fetchall()
+            # Oldest first, so the newest entries end up most recently used
+            for key, value, created in reversed(rows):
+                if not self._expired(created):
+                    self._store(key, value, created)
+            return len(rows)
+
+    def stats(self):
+        """Counters for /api/health"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "persistent": self._db is not None
+            }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _expired(self, created):
+        return bool(self.ttl) and time.time() - created > self.ttl
+
+    def _store(self, key, value, created):
+        self._entries[key] = (value, created)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+def main():
+    """Pre-warm the on-disk cache by translating a file of texts (one per line)"""
+    import argparse
+
+    from config import TranslationConfig
+    from segmentation import split_sentences
+    from translator import EnglishToOromoTranslator
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--cache", required=True, help="sqlite file used by the API (TRANSLATION_CACHE_PATH)")
+    parser.add_argument("--texts", required=True, help="Text file with one English phrase per line")
+    parser.add_argument("--model-path", default="./en-om-model")
+    parser.add_argument("--profile", default=TranslationConfig.DEFAULT_PROFILE,
+                        choices=list(TranslationConfig.DECODING_PROFILES),
+                        help="Decoding profile the API will look the translations up with")
+    # The backend and quantization are part of the model revision in every
+    # cache key, so they must match what the API serves
+    parser.add_argument("--backend", default=TranslationConfig.MODEL_BACKEND, choices=["torch", "onnx"],
+                        help="Inference backend the API uses (default: MODEL_BACKEND)")
+    parser.add_argument("--quantized", action=argparse.BooleanOptionalAction,
+                        default=TranslationConfig.MODEL_QUANTIZED,
+                        help="Whether the API serves the int8 model (default: MODEL_QUANTIZED)")
+    args = parser.parse_args()
+
+    with open(args.texts, encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+
+    # The API caches sentence by sentence (see segmentation.py)
+    texts = list(dict.fromkeys(
+        segment for line in lines
+        for segment in split_sentences(line, TranslationConfig.MAX_SEGMENT_WORDS)[0]
+    ))
+
+    if args.backend == "onnx":
+        from onnx_backend import OnnxTranslator
+        if args.quantized:
+            print("⚠️  --quantized has no effect with the onnx backend; using the float ONNX export")
+        translator = OnnxTranslator(args.model_path, num_threads=TranslationConfig.ONNX_NUM_THREADS)
+    else:
+        translator = EnglishToOromoTranslator(args.model_path, quantized=args.quantized)
+    cache = TranslationCache(path=args.cache, warm_entries=0)
+    params = TranslationConfig.DECODING_PROFILES[args.profile]
+
+    missing = [t for t in texts if cache.get(t, "en-om", translator.revision, params) is None]
+    translations = translator.translate_batch(missing, **params)
+
+    stored = 0
+    for text, translation in zip(missing, translations):
+        if translation:
+            cache.put(text, "en-om", translator.revision, params, translation)
+            stored += 1
+
+    cache.close()
+    print(f"✅ Cached {stored} new translations ({len(texts) - len(missing)} already cached)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,88 @@ English to Oromo Translation Model - Local Usage
 Place this file in the same directory as your extracted 'en-om-model' folder
 """
 
-from transformers import MarianMTModel, MarianTokenizer
+from transformers import LogitsProcessor, LogitsProcessorList, MarianMTModel, MarianTokenizer, StoppingCriteria, StoppingCriteriaList
 import torch
+import hashlib
+import math
 import os
+import time
+
+from metrics import BATCH_SIZE, DECODE_SECONDS, GENERATE_SECONDS, TOKENIZE_SECONDS
+
+def model_revision(model_path):
+    """
+    Short fingerprint of a model folder
+    
+    Hashes the config files' contents and the weight files' sizes and
+    modification times, so retraining or swapping the folder changes it
+    without reading hundreds of MB of weights.
+    """
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(model_path)):
+        path = os.path.join(model_path, name)
+        if not os.path.isfile(path):
+            continue
+        digest.update(name.encode("utf-8"))
+        if name.endswith(".json"):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        else:
+            stat = os.stat(path)
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+def output_length(input_length, max_length, length_ratio=None, length_offset=0):
+    """
+    Decoder max_length for an input of input_length tokens
+    
+    With length_ratio set, the output may have at most
+    length_ratio x input_length + length_offset new tokens (never more than
+    max_length allows), so short chat inputs stop early.
+    """
+    if length_ratio is None:
+        return max_length
+    # +1 for the decoder start token, which counts towards max_length
+    return min(max_length, 1 + math.ceil(length_ratio * input_length) + length_offset)
+
+class RowMaxLength(StoppingCriteria):
+    """Stop each row of a greedy batch at its own output_length()"""
+    
+    def __init__(self, max_lengths):
+        self.max_lengths = torch.tensor(max_lengths)
+    
+    def __call__(self, input_ids, scores, **kwargs):
+        return input_ids.shape[-1] >= self.max_lengths.to(input_ids.device)
+
+class RowForcedEOS(LogitsProcessor):
+    """Force the EOS token on each row's last step, as generate() does at max_length"""
+    
+    def __init__(self, max_lengths, eos_token_id):
+        self.max_lengths = torch.tensor(max_lengths)
+        self.eos_token_id = eos_token_id
+    
+    def __call__(self, input_ids, scores):
+        rows = input_ids.shape[-1] == self.max_lengths.to(input_ids.device) - 1
+        scores[rows] = -math.inf
+        scores[rows, self.eos_token_id] = 0
+        return scores
 
 class EnglishToOromoTranslator:
-    def __init__(self, model_path="./en-om-model"):
+    def __init__(self, model_path="./en-om-model", quantized=False):
         """
         Initialize the translator with your trained model
         
         Args:
             model_path (str): Path to your extracted model folder
+            quantized (bool): Use dynamic int8 Linear layers (see quantization.py)
         """
         self.model_path = model_path
+        self.quantized = quantized
         self.model = None
         self.tokenizer = None
+        self.revision = None
+        # Label for the inference metrics (see metrics.py)
+        self.backend = "torch-int8" if quantized else "torch"
         
         # Check if model exists
         if not os.path.exists(model_path):
@@ -30,7 +97,15 @@ class EnglishToOromoTranslator:
         """Load the model and tokenizer"""
         try:
             self.tokenizer = MarianTokenizer.from_pretrained(self.model_path)
-            self.model = MarianMTModel.from_pretrained(self.model_path)
+            
+            if self.quantized:
+                from quantization import QUANTIZED_SUFFIX, load_quantized
+                self.model = load_quantized(self.model_path)
+                # Quantized outputs differ slightly, so they get their own cache keys
+                self.revision = model_revision(self.model_path) + QUANTIZED_SUFFIX
+            else:
+                self.model = MarianMTModel.from_pretrained(self.model_path)
+                self.revision = model_revision(self.model_path)
             
             # Set to evaluation mode
             self.model.eval()
@@ -58,51 +133,180 @@ class EnglishToOromoTranslator:
             return ""
         
         try:
-            # Tokenize input
+            return self.generate_batch([text], max_length, num_beams)[0]
+        except Exception as e:
+            print(f"❌ Translation error: {e}")
+            return None
+    
+    def count_tokens(self, text, max_length=128):
+        """Number of input tokens the model will see for text (after truncation)"""
+        return len(self.tokenizer(text, truncation=True, max_length=max_length)["input_ids"])
+    
+    def batch_key(self, text, max_length=128, num_beams=4, length_ratio=None, length_offset=0):
+        """
+        Value that texts must share to be beam-searched in one generate() call
+        
+        Beam search runs one call per output length limit (see
+        generate_batch), so the MicroBatcher groups texts by it. Greedy
+        search stops each row at its own limit and needs no grouping.
+        """
+        if num_beams == 1 or length_ratio is None:
+            return None
+        return output_length(self.count_tokens(text, max_length), max_length, length_ratio, length_offset)
+    
+    def generate_batch(self, texts, max_length=128, num_beams=4,
+                       length_ratio=None, length_offset=0, deadline=None):
+        """
+        Translate a list of texts with a single generate() call
+        
+        Inputs are padded to the longest text, so callers should group
+        texts of similar length. Errors are raised rather than swallowed
+        so that a batching caller can report them per request.
+        
+        With length_ratio set, each text's output limit comes from its own
+        length, so its translation does not depend on its batchmates: greedy
+        rows stop at their own limit, and beam search runs one generate()
+        call per distinct limit.
+        
+        Args:
+            texts (list): English texts to translate
+            length_ratio (float): Limit new tokens to this multiple of the
+                input length (plus length_offset); see output_length()
+            deadline (float): time.monotonic() at which generation stops and
+                the best hypotheses so far are returned
+            
+        Returns:
+            list: Translated Oromo texts, in input order
+        """
+        if not texts:
+            return []
+        
+        BATCH_SIZE.observe(len(texts), backend=self.backend)
+        with TOKENIZE_SECONDS.time(backend=self.backend):
             inputs = self.tokenizer(
-                text, 
-                return_tensors="pt", 
-                padding=True, 
+                list(texts),
+                return_tensors="pt",
+                padding=True,
                 truncation=True,
                 max_length=max_length
             )
+        
+        limits = [
+            output_length(n, max_length, length_ratio, length_offset)
+            for n in inputs["attention_mask"].sum(dim=1).tolist()
+        ]
+        if num_beams == 1 or len(set(limits)) == 1:
+            groups = [list(range(len(texts)))]
+        else:
+            groups = [[i for i, limit in enumerate(limits) if limit == group] for group in sorted(set(limits))]
+        
+        translations = [None] * len(texts)
+        for rows in groups:
+            group_limits = [limits[i] for i in rows]
+            # Inputs are right-padded, so the group's extra padding columns can go
+            width = int(inputs["attention_mask"][rows].sum(dim=1).max())
+            options = {}
+            if deadline is not None:
+                options["max_time"] = max(0.0, deadline - time.monotonic())
+            if len(set(group_limits)) > 1:
+                options["stopping_criteria"] = StoppingCriteriaList([RowMaxLength(group_limits)])
+                forced_eos = self.model.generation_config.forced_eos_token_id
+                if forced_eos is not None:
+                    options["logits_processor"] = LogitsProcessorList([RowForcedEOS(group_limits, forced_eos)])
             
-            # Generate translation
-            with torch.no_grad():
+            with GENERATE_SECONDS.time(backend=self.backend), torch.no_grad():
                 outputs = self.model.generate(
-                    **inputs,
-                    max_length=max_length,
+                    input_ids=inputs["input_ids"][rows, :width],
+                    attention_mask=inputs["attention_mask"][rows, :width],
+                    max_length=max(group_limits),
                     num_beams=num_beams,
                     early_stopping=True,
-                    do_sample=False
+                    do_sample=False,
+                    **options
                 )
             
-            # Decode output
-            translation = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            return translation
-            
-        except Exception as e:
-            print(f"❌ Translation error: {e}")
-            return None
+            with DECODE_SECONDS.time(backend=self.backend):
+                for i, translation in zip(rows, self.tokenizer.batch_decode(outputs, skip_special_tokens=True)):
+                    translations[i] = translation
+        
+        return translations
     
-    def translate_batch(self, texts, max_length=128, num_beams=4):
+    def make_buckets(self, texts, max_length=128, max_batch_tokens=2048, max_batch_size=32):
+        """
+        Group texts of similar token length into batches
+        
+        Texts are sorted by length and packed greedily, so that each
+        bucket's padded size (bucket size x longest text) stays within
+        max_batch_tokens.
+        
+        Returns:
+            list: Lists of indices into texts, one list per bucket
+        """
+        lengths = [
+            len(ids) for ids in
+            self.tokenizer(list(texts), truncation=True, max_length=max_length)["input_ids"]
+        ]
+        order = sorted(range(len(texts)), key=lambda i: lengths[i])
+        
+        buckets = []
+        bucket = []
+        for i in order:
+            # Sorted ascending, so the new text is the longest in the bucket
+            padded = (len(bucket) + 1) * lengths[i]
+            if bucket and (padded > max_batch_tokens or len(bucket) >= max_batch_size):
+                buckets.append(bucket)
+                bucket = []
+            bucket.append(i)
+        if bucket:
+            buckets.append(bucket)
+        
+        return buckets
+    
+    def translate_batch(self, texts, max_length=128, num_beams=4,
+                        max_batch_tokens=2048, max_batch_size=32,
+                        length_ratio=None, length_offset=0):
         """
         Translate multiple texts at once
         
+        Texts are bucketed by token length so padding stays small, and
+        each bucket is translated with a single generate() call.
+        
         Args:
             texts (list): List of English texts to translate
+            max_batch_tokens (int): Padded token budget per generate() call
+            max_batch_size (int): Maximum number of texts per generate() call
+            length_ratio (float): See generate_batch()
             
         Returns:
-            list: List of translated Oromo texts
+            list: List of translated Oromo texts, in input order
+                (None for texts whose batch failed)
         """
-        translations = []
+        translations = ["" for _ in texts]
+        
+        # Empty inputs translate to "" just like translate()
+        indices = [i for i, text in enumerate(texts) if text.strip()]
+        if not indices:
+            return translations
         
-        print(f"🔄 Translating {len(texts)} texts...")
+        buckets = self.make_buckets(
+            [texts[i] for i in indices], max_length, max_batch_tokens, max_batch_size
+        )
         
-        for i, text in enumerate(texts, 1):
-            translation = self.translate(text, max_length, num_beams)
-            translations.append(translation)
-            print(f"✅ {i}/{len(texts)} completed")
+        print(f"🔄 Translating {len(indices)} texts in {len(buckets)} batches...")
+        
+        for bucket in buckets:
+            bucket_indices = [indices[i] for i in bucket]
+            try:
+                outputs = self.generate_batch(
+                    [texts[i] for i in bucket_indices], max_length, num_beams,
+                    length_ratio=length_ratio, length_offset=length_offset
+                )
+            except Exception as e:
+                print(f"❌ Translation error: {e}")
+                outputs = [None] * len(bucket_indices)
+            
+            for i, output in zip(bucket_indices, outputs):
+                translations[i] = output
         
         return translations
 
@@ -0,0 +1,361 @@
+"""
+Lookup indexes for dictionary autocomplete (/api/suggestions)
+
+Built once when the dictionary compiles, so each keystroke only does a
+bounded amount of work regardless of the dictionary size. Both indexes
+keep their state in flat typed arrays (see arrays()/from_arrays()), which
+dictionary_store.py writes into the compiled dictionary; workers then
+query them straight from the shared memory map.
+"""
+
+import heapq
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from collections.abc import Sequence
+from difflib import SequenceMatcher
+
+WORD_PATTERN = re.compile(r"[\w']+")
+
+# Sorts after every character that can follow a prefix
+_MAX_CHAR = "\U0010ffff"
+
+# Bit widths of a packed (bigram, word length, position) posting key
+_CHAR_BITS = 21
+_SIZE_BITS = 11
+
+
+def bounded_edit_distance(a, b, max_distance):
+    """Levenshtein distance, or max_distance + 1 as soon as it must exceed max_distance"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+
+    return min(previous[-1], max_distance + 1)
+
+
+def load_word_frequencies(*paths):
+    """Count lowercased word occurrences in one or more corpus text files"""
+    counts = Counter()
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    counts.update(WORD_PATTERN.findall(line.lower()))
+        except OSError:
+            continue
+    return counts
+
+
+class PackedStrings(Sequence):
+    """Read-only sequence of strings stored as UTF-8 data plus uint32 offsets"""
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    @staticmethod
+    def pack(strings):
+        """(offsets, data) arrays holding strings"""
+        offsets, data = array("I"), array("B")
+        for value in strings:
+            offsets.append(len(data))
+            data.frombytes(value.encode("utf-8"))
+        offsets.append(len(data))
+        return offsets, data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return str(self.data[self.offsets[index]:self.offsets[index + 1]], "utf-8")
+
+
+class PrefixIndex:
+    # Typecode of each array in arrays()
+    ARRAYS = {"weights": "I", "top_prefix_offsets": "I", "top_prefix_data": "B", "top_starts": "I", "top_ids": "I"}
+
+    def __init__(self, words, weights=None, max_results=10, dense_threshold=64):
+        """
+        Sorted-array prefix index returning the highest-weighted completions
+
+        Completions for a prefix are a contiguous range of the sorted word
+        list, found with bisect. Ranges larger than dense_threshold have their
+        top max_results precomputed, so a query never ranks more than
+        dense_threshold words and costs O(prefix + k).
+
+        Args:
+            words (iterable): Headwords to index (lowercased)
+            weights (dict): Word -> frequency weight (missing words weigh 0)
+            max_results (int): Largest limit a query can ask for
+            dense_threshold (int): Range size above which top results are precomputed
+        """
+        weights = weights or {}
+        self.words = sorted(set(word.lower() for word in words))
+        self.weights = array("I", (min(weights.get(word, 0), 0xffffffff) for word in self.words))
+        self.max_results = max_results
+        self.dense_threshold = dense_threshold
+
+        top = self._precompute()
+        prefixes = sorted(top)
+        self._top_prefixes = PackedStrings(*PackedStrings.pack(prefixes))
+        self._top_starts, self._top_ids = array("I", [0]), array("I")
+        for prefix in prefixes:
+            self._top_ids.extend(top[prefix])
+            self._top_starts.append(len(self._top_ids))
+
+    @classmethod
+    def from_arrays(cls, words, arrays, max_results=10, dense_threshold=64):
+        """
+        Index over arrays saved by arrays(), without copying them
+
+        Args:
+            words (sequence): The sorted headwords the arrays were built from
+            arrays (dict): Name -> array (or memoryview) for every name in ARRAYS
+        """
+        index = cls.__new__(cls)
+        index.words = words
+        index.weights = arrays["weights"]
+        index.max_results = max_results
+        index.dense_threshold = dense_threshold
+        index._top_prefixes = PackedStrings(arrays["top_prefix_offsets"], arrays["top_prefix_data"])
+        index._top_starts = arrays["top_starts"]
+        index._top_ids = arrays["top_ids"]
+        return index
+
+    def arrays(self):
+        """Name -> array for from_arrays()"""
+        return {
+            "weights": self.weights,
+            "top_prefix_offsets": self._top_prefixes.offsets,
+            "top_prefix_data": self._top_prefixes.data,
+            "top_starts": self._top_starts,
+            "top_ids": self._top_ids
+        }
+
+    def __len__(self):
+        return len(self.words)
+
+    def complete(self, prefix, limit=5):
+        """Return up to limit words starting with prefix, most frequent first"""
+        prefix = prefix.lower()
+        limit = min(limit, self.max_results)
+
+        top = self._precomputed(prefix)
+        if top is None:
+            lo, hi = self._prefix_range(prefix)
+            top = self._rank(lo, hi, limit)
+
+        return [self.words[i] for i in top[:limit]]
+
+    def _prefix_range(self, prefix, lo=0, hi=None):
+        if hi is None:
+            hi = len(self.words)
+        lo = bisect_left(self.words, prefix, lo, hi)
+        hi = bisect_left(self.words, prefix + _MAX_CHAR, lo, hi)
+        return lo, hi
+
+    def _precomputed(self, prefix):
+        i = bisect_left(self._top_prefixes, prefix)
+        if i < len(self._top_prefixes) and self._top_prefixes[i] == prefix:
+            return self._top_ids[self._top_starts[i]:self._top_starts[i + 1]]
+        return None
+
+    def _rank(self, lo, hi, k):
+        # Ties go to the alphabetically first word (lower index)
+        return heapq.nsmallest(k, range(lo, hi), key=lambda i: (-self.weights[i], i))
+
+    def _precompute(self):
+        """Top results for every prefix whose range is too large to rank per query"""
+        top = {}
+        stack = [("", 0, len(self.words))]
+
+        while stack:
+            prefix, lo, hi = stack.pop()
+            if hi - lo <= self.dense_threshold:
+                continue
+
+            top[prefix] = self._rank(lo, hi, self.max_results)
+
+            # Split the range by the next character; the word equal to the
+            # prefix itself (if any) sorts first and has no next character
+            depth = len(prefix)
+            i = lo
+            if len(self.words[i]) == depth:
+                i += 1
+            while i < hi:
+                child = prefix + self.words[i][depth]
+                _, end = self._prefix_range(child, i, hi)
+                stack.append((child, i, end))
+                i = end
+
+        return top
+
+
+class FuzzyIndex:
+    # Typecode of each array in arrays()
+    ARRAYS = {"gram_keys": "Q", "gram_starts": "I", "gram_ids": "I", "length_starts": "I", "length_ids": "I"}
+
+    def __init__(self, words, max_distance=2, min_query_length=None):
+        """
+        Positional bigram index for "did you mean" suggestions
+
+        Postings are keyed on (bigram, word length, position). Each edit
+        changes at most two of the query's bigrams and shifts the rest by at
+        most one position, so a word within max_distance edits shares at
+        least len(query) + 1 - 2 * max_distance bigrams with the query within
+        max_distance positions. Counting those prunes most of the dictionary
+        before any string comparison.
+
+        Queries shorter than 2 * max_distance need no shared bigram at all,
+        so nothing would prune them and every word of a nearby length would
+        be compared. By default they get no fuzzy matches.
+
+        Postings are stored as one sorted array of packed keys, their start
+        offsets and the concatenated word ids. Words too long to pack a key
+        for (over 2046 characters) are only found by length.
+
+        Args:
+            words (iterable): Headwords to index (lowercased)
+            max_distance (int): Largest edit distance a suggestion may have
+            min_query_length (int): Shortest query to match (default: 2 * max_distance)
+        """
+        self.words = sorted(set(word.lower() for word in words))
+        self.max_distance = max_distance
+        self.min_query_length = 2 * max_distance if min_query_length is None else min_query_length
+        postings = defaultdict(lambda: array("I"))
+        by_length = defaultdict(lambda: array("I"))
+
+        for i, word in enumerate(self.words):
+            by_length[len(word)].append(i)
+            for position, gram in self._bigrams(word):
+                key = self._key(gram, len(word), position)
+                if key is not None:
+                    postings[key].append(i)
+
+        self._gram_keys, self._gram_starts, self._gram_ids = array("Q"), array("I", [0]), array("I")
+        for key in sorted(postings):
+            self._gram_keys.append(key)
+            self._gram_ids.extend(postings[key])
+            self._gram_starts.append(len(self._gram_ids))
+
+        self._length_starts, self._length_ids = array("I", [0]), array("I")
+        for length in range(max(by_length, default=-1) + 1):
+            self._length_ids.extend(by_length.get(length, ()))
+            self._length_starts.append(len(self._length_ids))
+
+    @classmethod
+    def from_arrays(cls, words, arrays, max_distance=2, min_query_length=None):
+        """
+        Index over arrays saved by arrays(), without copying them
+
+        Args:
+            words (sequence): The sorted headwords the arrays were built from
+            arrays (dict): Name -> array (or memoryview) for every name in ARRAYS
+        """
+        index = cls.__new__(cls)
+        index.words = words
+        index.max_distance = max_distance
+        index.min_query_length = 2 * max_distance if min_query_length is None else min_query_length
+        index._gram_keys = arrays["gram_keys"]
+        index._gram_starts = arrays["gram_starts"]
+        index._gram_ids = arrays["gram_ids"]
+        index._length_starts = arrays["length_starts"]
+        index._length_ids = arrays["length_ids"]
+        return index
+
+    def arrays(self):
+        """Name -> array for from_arrays()"""
+        return {
+            "gram_keys": self._gram_keys,
+            "gram_starts": self._gram_starts,
+            "gram_ids": self._gram_ids,
+            "length_starts": self._length_starts,
+            "length_ids": self._length_ids
+        }
+
+    def __len__(self):
+        return len(self.words)
+
+    @staticmethod
+    def _bigrams(word):
+        padded = f"${word}$"
+        return [(i, padded[i:i + 2]) for i in range(len(padded) - 1)]
+
+    @staticmethod
+    def _key(gram, length, position):
+        """(bigram, length, position) packed into one uint64, or None if it does not fit"""
+        if length >> _SIZE_BITS or position >> _SIZE_BITS:
+            return None
+        return ((ord(gram[0]) << _CHAR_BITS | ord(gram[1])) << _SIZE_BITS | length) << _SIZE_BITS | position
+
+    def _postings(self, gram, length, position):
+        key = self._key(gram, length, position)
+        i = bisect_left(self._gram_keys, key) if key is not None else len(self._gram_keys)
+        if i < len(self._gram_keys) and self._gram_keys[i] == key:
+            return self._gram_ids[self._gram_starts[i]:self._gram_starts[i + 1]]
+        return ()
+
+    def _with_length(self, length):
+        if length + 1 >= len(self._length_starts):
+            return ()
+        return self._length_ids[self._length_starts[length]:self._length_starts[length + 1]]
+
+    def _candidates(self, query):
+        d = self.max_distance
+        lengths = range(max(0, len(query) - d), len(query) + d + 1)
+        grams = self._bigrams(query)
+        min_shared = len(grams) - 2 * d
+
+        if min_shared <= 0:
+            # Too short for the bigram filter to prune anything
+            return [i for length in lengths for i in self._with_length(length)]
+
+        shared = Counter()
+        for length in lengths:
+            for position, gram in grams:
+                for nearby in range(max(0, position - d), position + d + 1):
+                    shared.update(self._postings(gram, length, nearby))
+
+        return [i for i, count in shared.items() if count >= min_shared]
+
+    def close_matches(self, query, n=5, cutoff=0.6):
+        """
+        Same results as difflib.get_close_matches(query, words, n, cutoff),
+        restricted to words within max_distance edits of the query (none
+        for queries shorter than min_query_length)
+        """
+        query = query.lower()
+        if len(query) < self.min_query_length:
+            return []
+
+        # Mirror get_close_matches: cheap upper bounds first, then the real ratio
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        results = []
+        for i in self._candidates(query):
+            word = self.words[i]
+            matcher.set_seq1(word)
+            if (matcher.real_quick_ratio() >= cutoff and
+                    matcher.quick_ratio() >= cutoff and
+                    bounded_edit_distance(query, word, self.max_distance) <= self.max_distance):
+                score = matcher.ratio()
+                if score >= cutoff:
+                    results.append((score, word))
+
+        return [word for _, word in heapq.nlargest(n, results)]
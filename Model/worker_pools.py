@@ -0,0 +1,103 @@
+"""
+Bounded worker pools for the ASGI app
+
+Dictionary lookups and model inference each get their own thread pool with
+its own concurrency limit and queue bound, so a burst of slow sentence
+translations fills the model pool's queue without delaying word lookups
+and autocomplete in the dictionary pool. Requests arriving while a pool's
+queue is full are rejected instead of piling up.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PoolFull(Exception):
+    """Raised when a pool's queue has no room for another request"""
+
+
+class WorkerPool:
+    def __init__(self, name, max_workers, max_queue):
+        """
+        A thread pool with a bounded queue and queue-depth statistics
+
+        Args:
+            name (str): Pool name, used for its threads and in stats
+            max_workers (int): Requests running at the same time
+            max_queue (int): Requests waiting for a free worker before new
+                ones are rejected with PoolFull
+        """
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.peak_queued = 0
+        self._started = 0
+        self._queue_seconds = 0.0
+
+    async def run(self, function, *args, admitted=False):
+        """
+        Run function(*args) on a worker thread and return its result
+
+        Args:
+            admitted (bool): Skip the queue bound, for follow-up work of a
+                request that was already accepted (e.g. the rest of a stream)
+
+        Raises:
+            PoolFull: The queue is full
+        """
+        with self._lock:
+            if not admitted and self.queued >= self.max_queue:
+                self.rejected += 1
+                raise PoolFull(self.name)
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+
+        enqueued = time.monotonic()
+
+        def call():
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self._started += 1
+                self._queue_seconds += time.monotonic() - enqueued
+            try:
+                return function(*args)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+
+        future = self._executor.submit(call)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # A request abandoned before a worker picked it up leaves the queue
+            if future.cancel():
+                with self._lock:
+                    self.queued -= 1
+            raise
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "queued": self.queued,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_queue_ms": round(self._queue_seconds / self._started * 1000, 2) if self._started else 0.0
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -85,6 +85,71 @@ const TranslationTool = () => {
     }
   };
 
+  // Stream a sentence translation, showing each sentence as soon as it arrives
+  const streamTranslation = async (body) => {
+    const response = await fetch(`${API_BASE}/translate/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(body)
+    });
+
+    if (!response.ok) {
+      const data = await response.json();
+      setTranslationResult({
+        success: false,
+        message: data.message || 'Translation failed',
+        original: body.text
+      });
+      return;
+    }
+
+    // Server-Sent Events: "event: ...\ndata: {...}\n\n"
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const translations = [];
+    let separators = [];
+    let buffer = '';
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const message = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        const event = message.match(/^event: (.*)$/m)?.[1];
+        const data = JSON.parse(message.match(/^data: (.*)$/m)?.[1] || '{}');
+
+        if (event === 'start') {
+          separators = data.separators;
+        } else if (event === 'segment') {
+          translations[data.index] = data.translation;
+        } else if (event === 'error') {
+          throw new Error(data.message);
+        }
+
+        // Untranslated sentences are left out until they arrive
+        const translation = event === 'done'
+          ? data.translation
+          : separators.map((separator, index) => separator + (translations[index] || '')).join('').trim();
+
+        setTranslationResult({
+          success: true,
+          translation,
+          original: body.text,
+          source_lang: body.source_lang,
+          type: 'sentence',
+          complete: event === 'done'
+        });
+      }
+    }
+  };
+
   // Handle translation
   const handleTranslate = async () => {
     if (!inputText.trim()) {
@@ -96,6 +161,14 @@ const TranslationTool = () => {
     setError('');
 
     try {
+      if (translationType === 'sentence') {
+        await streamTranslation({
+          text: inputText.trim(),
+          source_lang: sourceLang
+        });
+        return;
+      }
+
       const response = await fetch(`${API_BASE}/translate`, {
         method: 'POST',
         headers: {
@@ -362,7 +435,7 @@ const TranslationTool = () => {
                   </div>
                 ) : (
                   <div className="p-4 bg-blue-50 rounded-lg border border-blue-200">
-                    <p className="text-lg text-blue-900">{translationResult.translation}</p>
+                    <p className="text-lg text-blue-900 whitespace-pre-line">{translationResult.translation}</p>
                   </div>
                 )}
               </div>